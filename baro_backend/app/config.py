@@ -12,6 +12,56 @@ SUPABASE_AUTH_SCHEMA = "app"
 SUPABASE_USERS_TABLE = "user_profile"
 SUPABASE_PROFILES_TABLE = "user_profile"
 
+# 시설/운동강도 같은 참조 테이블을 메모리에 들고 있다가 다시 읽어오는 주기 (초)
+FACILITY_SNAPSHOT_TTL_SEC = int(os.getenv("FACILITY_SNAPSHOT_TTL_SEC", 6 * 60 * 60))
+# 로컬 시설 저장소 디렉터리 (python -m app.modules.facility.store export 로 생성). 비워두면 Supabase 에서 읽음
+FACILITY_STORE_PATH = os.getenv("FACILITY_STORE_PATH", "")
+
+# 시설 추천 한 건에 허용하는 전체 시간 (초), 그중 날씨 응답을 기다려 주는 최대 시간 (초)
+RECOMMEND_DEADLINE_SEC = float(os.getenv("RECOMMEND_DEADLINE_SEC", 8.0))
+RECOMMEND_WEATHER_WAIT_SEC = float(os.getenv("RECOMMEND_WEATHER_WAIT_SEC", 1.5))
+# 추천 경로에서 외부 호출(Supabase, 기상청)을 동시에 돌리는 스레드 수
+RECOMMEND_IO_WORKERS = int(os.getenv("RECOMMEND_IO_WORKERS", 8))
+
+# 추천 결과 캐시: 위치를 몇 m 격자로 묶을지, 몇 초 동안 / 몇 개까지 들고 있을지
+RECOMMEND_CACHE_CELL_M = float(os.getenv("RECOMMEND_CACHE_CELL_M", 100))
+RECOMMEND_CACHE_TTL_SEC = float(os.getenv("RECOMMEND_CACHE_TTL_SEC", 300))
+RECOMMEND_CACHE_SIZE = int(os.getenv("RECOMMEND_CACHE_SIZE", 4096))
+
+# 모집 중 파티 위치 인덱스를 DB 에서 통째로 다시 만드는 주기 (초). 평소엔 쓰기 때마다 바로 반영됨
+PARTY_INDEX_REBUILD_SEC = float(os.getenv("PARTY_INDEX_REBUILD_SEC", 300))
+
+# 날씨 미리 받기: 매시 XX:40 발표 후 몇 초 뒤에(+ 0~JITTER 랜덤) 최근 ACTIVE_SEC 안에 요청 있던 격자를 갱신
+WEATHER_PREFETCH_DELAY_SEC = float(os.getenv("WEATHER_PREFETCH_DELAY_SEC", 60))
+WEATHER_PREFETCH_JITTER_SEC = float(os.getenv("WEATHER_PREFETCH_JITTER_SEC", 120))
+WEATHER_PREFETCH_WORKERS = int(os.getenv("WEATHER_PREFETCH_WORKERS", 4))
+WEATHER_PREFETCH_ACTIVE_SEC = float(os.getenv("WEATHER_PREFETCH_ACTIVE_SEC", 3 * 60 * 60))
+
+# 기상청 장애 시: 마지막 관측값을 몇 초 전 것까지 대신 쓸지, 몇 번 연속 실패하면 호출을 끊고 몇 초 뒤 다시 시험할지
+WEATHER_STALE_MAX_SEC = float(os.getenv("WEATHER_STALE_MAX_SEC", 3 * 60 * 60))
+WEATHER_BREAKER_FAILURES = int(os.getenv("WEATHER_BREAKER_FAILURES", 3))
+WEATHER_BREAKER_RESET_SEC = float(os.getenv("WEATHER_BREAKER_RESET_SEC", 60))
+
+# 외부 HTTP 공용 클라이언트(app/core/http.py): upstream 별 keep-alive 연결 풀 크기와 read timeout,
+# 공통 connect timeout, 멱등 요청(GET/PUT/DELETE) 재시도 횟수와 backoff 배수 (초)
+HTTP_CONNECT_TIMEOUT_SEC = float(os.getenv("HTTP_CONNECT_TIMEOUT_SEC", 3))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 2))
+HTTP_BACKOFF_SEC = float(os.getenv("HTTP_BACKOFF_SEC", 0.2))
+SUPABASE_HTTP_POOL_SIZE = int(os.getenv("SUPABASE_HTTP_POOL_SIZE", 20))
+SUPABASE_HTTP_READ_TIMEOUT_SEC = float(os.getenv("SUPABASE_HTTP_READ_TIMEOUT_SEC", 10))
+KMA_HTTP_POOL_SIZE = int(os.getenv("KMA_HTTP_POOL_SIZE", 8))
+KMA_HTTP_READ_TIMEOUT_SEC = float(os.getenv("KMA_HTTP_READ_TIMEOUT_SEC", 5))
+KAKAO_HTTP_POOL_SIZE = int(os.getenv("KAKAO_HTTP_POOL_SIZE", 4))
+KAKAO_HTTP_READ_TIMEOUT_SEC = float(os.getenv("KAKAO_HTTP_READ_TIMEOUT_SEC", 5))
+
+# 인증된 요청마다 읽는 user_profile 을 uuid 별로 잠깐 들고 있는 캐시 (프로필 수정 / 삭제 / 매너온도 갱신 시 바로 비움)
+USER_PROFILE_CACHE_TTL_SEC = float(os.getenv("USER_PROFILE_CACHE_TTL_SEC", 30))
+USER_PROFILE_CACHE_SIZE = int(os.getenv("USER_PROFILE_CACHE_SIZE", 10_000))
+
+# /internal/* 운영용 엔드포인트(캐시 통계, 날씨 미리 받기 상태) 토큰. 비워두면 엔드포인트 자체가 꺼짐(404),
+# 설정하면 X-Internal-Token 헤더가 이 값과 같을 때만 응답 (격자별 요청 시각이 대략적인 사용자 위치라 공개 금지)
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN", "")
+
 
 if not SUPABASE_URL or not SUPABASE_ANON_KEY:
     raise RuntimeError("Supabase 환경변수(SUPABASE_URL, SUPABASE_ANON_KEY)를 설정하세요.")
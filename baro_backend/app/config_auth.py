@@ -5,5 +5,11 @@ import os
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "change-me-in-production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRE_DAYS = int(os.getenv("JWT_EXPIRE_DAYS", 7))
+# 한 번 검증한 토큰(해시 -> user_id, exp)을 만료 시각까지 들고 있는 개수, 로그아웃한 토큰 목록 최대 개수
+JWT_VERIFY_CACHE_SIZE = int(os.getenv("JWT_VERIFY_CACHE_SIZE", 10_000))
+JWT_REVOKED_SIZE = int(os.getenv("JWT_REVOKED_SIZE", 100_000))
 
-KAKAO_USERINFO_URL = "https://kapi.kakao.com/v2/user/me"
\ No newline at end of file
+KAKAO_USERINFO_URL = "https://kapi.kakao.com/v2/user/me"
+# 카카오 access token -> (kakao_id, 닉네임) 조회 결과를 들고 있는 시간 (초) / 개수. 앱 재시작마다 같은 토큰으로 로그인함
+KAKAO_TOKEN_CACHE_TTL_SEC = float(os.getenv("KAKAO_TOKEN_CACHE_TTL_SEC", 10 * 60))
+KAKAO_TOKEN_CACHE_SIZE = int(os.getenv("KAKAO_TOKEN_CACHE_SIZE", 10_000))
\ No newline at end of file
@@ -0,0 +1,158 @@
+# app/core/cache.py
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    크기 제한(LRU) + 만료 시간(TTL)이 있는 프로세스 내 캐시.
+    - 가득 차면 가장 오래 안 쓴 항목부터 버림
+    - 항목마다 ttl_sec 를 따로 줄 수 있음 (안 주면 기본값)
+    - 여러 스레드에서 같이 써도 되도록 lock 으로 보호
+    - hits / misses / evictions / expirations 통계를 들고 있음
+    """
+
+    def __init__(self, maxsize: int, ttl_sec: float, name: str = "cache") -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_sec = ttl_sec
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, ttl_sec: Optional[float] = None) -> None:
+        ttl = self.ttl_sec if ttl_sec is None else ttl_sec
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_sec": self.ttl_sec,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class ExpiringSet(Generic[K]):
+    """
+    항목마다 만료 시각이 있는 프로세스 내 집합. TTLCache 와 달리 만료 전 항목을 밀어내지 않는다.
+    - 가득 차면 이미 만료된 것부터 정리하고, 그래도 차 있으면 새 항목을 받지 않음 (add() 가 False)
+    - ttl_sec=None 이면 만료 없이 계속 들고 있음
+    거부 목록처럼 "빠지면 안 되는" 값에 쓴다 (빠지는 순간 다시 허용되므로).
+    """
+
+    def __init__(self, maxsize: int, name: str = "set") -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self._expires: Dict[K, float] = {}
+        self._heap: List[Tuple[float, int, K]] = []  # (만료 시각, 순번, key). 갱신된 key 의 옛 항목은 꺼낼 때 무시
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def __contains__(self, key: K) -> bool:
+        with self._lock:
+            expires_at = self._expires.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._expires[key]
+                self.expirations += 1
+                return False
+            return True
+
+    def add(self, key: K, ttl_sec: Optional[float] = None) -> bool:
+        """key 를 ttl_sec 동안 넣음. 자리가 없어서 못 넣으면 False."""
+        expires_at = float("inf") if ttl_sec is None else time.monotonic() + ttl_sec
+        with self._lock:
+            if key not in self._expires and len(self._expires) >= self.maxsize:
+                self._purge_expired()
+                if len(self._expires) >= self.maxsize:
+                    self.rejected += 1
+                    return False
+            self._expires[key] = max(expires_at, self._expires.get(key, expires_at))
+            self._seq += 1
+            heapq.heappush(self._heap, (self._expires[key], self._seq, key))
+            return True
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(self._heap)
+            if self._expires.get(key) == expires_at:
+                del self._expires[key]
+                self.expirations += 1
+        if len(self._heap) > 2 * max(len(self._expires), 1):
+            # 갱신/조회로 지워진 key 의 옛 항목이 쌓이면 한 번 새로 만듦
+            self._heap = [(e, i, k) for i, (k, e) in enumerate(self._expires.items())]
+            heapq.heapify(self._heap)
+            self._seq = len(self._heap)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expires.clear()
+            self._heap.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": len(self._expires),
+                "maxsize": self.maxsize,
+                "rejected": self.rejected,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,74 @@
+# app/core/circuit.py
+import threading
+import time
+from typing import Any, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    외부 의존성이 계속 실패할 때 호출 자체를 잠시 끊는 회로 차단기.
+    - closed: 평소. 연속 실패가 failure_threshold 번이 되면 open
+    - open: allow() 가 False. reset_sec 가 지나면 try_probe() 가 딱 한 번 True 를 주고 half_open
+    - half_open: 시험 호출 하나만 나가 있는 상태. 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_sec: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_sec = reset_sec
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        """지금 실제로 호출해도 되는지. 막힌 경우 short_circuited 를 센다."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            self.short_circuited += 1
+            return False
+
+    def try_probe(self) -> bool:
+        """open 상태에서 reset_sec 가 지났으면 시험 호출 한 번을 허락 (동시에 하나만)."""
+        with self._lock:
+            if self._state != OPEN or self._opened_at is None:
+                return False
+            if time.monotonic() - self._opened_at < self.reset_sec:
+                return False
+            self._state = HALF_OPEN
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self._state,
+                "failures": self._failures,
+                "open_for_sec": (
+                    round(time.monotonic() - self._opened_at, 1) if self._opened_at else None
+                ),
+                "short_circuited": self.short_circuited,
+            }
@@ -0,0 +1,157 @@
+# app/core/geo.py
+import math
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG_LAT = 111.32
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(
+        dlambda / 2
+    ) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return EARTH_RADIUS_KM * c
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    (lat, lon) 중심 반경 radius_km 원을 완전히 덮는 위경도 사각형.
+    (min_lat, max_lat, min_lon, max_lon) 반환.
+    """
+    dlat = radius_km / KM_PER_DEG_LAT
+    # 경도 1도의 길이는 극으로 갈수록 짧아지니까, 박스 안에서 가장 고위도 기준으로 넉넉하게 잡음
+    edge_lat = min(89.9, abs(lat) + dlat)
+    dlon = radius_km / (KM_PER_DEG_LAT * math.cos(math.radians(edge_lat)))
+    return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+
+
+def grid_cell(lat: float, lon: float, cell_km: float, ref_lat: float = 37.5) -> Tuple[int, int]:
+    """
+    (lat, lon) 을 대략 cell_km x cell_km 크기 격자의 셀 번호로 양자화.
+    ref_lat 위도 기준으로 경도 간격을 잡는다 (서비스 지역 근처에서 정사각형에 가깝게).
+    """
+    dlat = cell_km / KM_PER_DEG_LAT
+    dlon = cell_km / (KM_PER_DEG_LAT * math.cos(math.radians(ref_lat)))
+    return math.floor(lat / dlat), math.floor(lon / dlon)
+
+
+class GridIndex:
+    """
+    균일한 위경도 격자(cell_km 크기) 위에 점들을 버킷으로 나눠 담는 공간 인덱스.
+    - within(): 반경 안의 점만 (key, 거리) 로 반환
+    - nearest(): 가까운 k개 반환
+    격자는 ref_lat 기준으로 대략 cell_km x cell_km 가 되도록 잡고,
+    실제 판정은 항상 haversine 거리로 하기 때문에 다른 위도에서도 결과는 정확하다.
+    """
+
+    def __init__(self, cell_km: float = 1.0, ref_lat: float = 37.5) -> None:
+        self.cell_km = cell_km
+        self._dlat = cell_km / KM_PER_DEG_LAT
+        self._dlon = cell_km / (KM_PER_DEG_LAT * math.cos(math.radians(ref_lat)))
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self._points: Dict[Hashable, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._points
+
+    def _cell_of(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self._dlat), math.floor(lon / self._dlon)
+
+    # ------------------ 추가 / 삭제 ------------------ #
+    def insert(self, key: Hashable, lat: float, lon: float) -> None:
+        if key in self._points:
+            self.remove(key)
+        self._points[key] = (lat, lon)
+        self._cells.setdefault(self._cell_of(lat, lon), set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+        cell = self._cell_of(*point)
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._cells[cell]
+
+    # ------------------ 조회 ------------------ #
+    def within(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        predicate: Optional[Callable[[Hashable], bool]] = None,
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        반경 radius_km 이내의 점들을 (key, 거리 km) 로, 가까운 순서로 반환.
+        predicate 를 주면 거리 계산 전에 key 로 먼저 걸러낸다.
+        """
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        i0, j0 = self._cell_of(min_lat, min_lon)
+        i1, j1 = self._cell_of(max_lat, max_lon)
+
+        found: List[Tuple[Hashable, float]] = []
+        # 박스가 격자 전체보다 훨씬 크면 셀을 도는 것보다 전체를 보는 게 싸다
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self._cells):
+            candidates = (
+                key for bucket in self._cells.values() for key in bucket
+            )
+        else:
+            candidates = (
+                key
+                for i in range(i0, i1 + 1)
+                for j in range(j0, j1 + 1)
+                for key in self._cells.get((i, j), ())
+            )
+
+        for key in candidates:
+            if predicate is not None and not predicate(key):
+                continue
+            p_lat, p_lon = self._points[key]
+            d = haversine_km(lat, lon, p_lat, p_lon)
+            if d <= radius_km:
+                found.append((key, d))
+
+        found.sort(key=lambda x: x[1])
+        return found
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_radius_km: Optional[float] = None,
+        predicate: Optional[Callable[[Hashable], bool]] = None,
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        가까운 순서로 최대 k개. 반경을 두 배씩 넓혀가며 k개가 모일 때까지 찾는다.
+        predicate 는 within() 과 같이 거리 계산 전에 key 로 거른다.
+        """
+        if k <= 0 or not self._points:
+            return []
+
+        radius = self.cell_km
+        while True:
+            if max_radius_km is not None and radius >= max_radius_km:
+                return self.within(lat, lon, max_radius_km, predicate)[:k]
+            found = self.within(lat, lon, radius, predicate)
+            if len(found) >= k or self._covers_all(lat, lon, radius):
+                return found[:k]
+            radius *= 2
+
+    def _covers_all(self, lat: float, lon: float, radius_km: float) -> bool:
+        """반경을 덮는 박스가 지금 들어 있는 모든 셀을 포함하는지 (더 넓혀도 새로 찾을 게 없는지)."""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        i0, j0 = self._cell_of(min_lat, min_lon)
+        i1, j1 = self._cell_of(max_lat, max_lon)
+        return all(i0 <= i <= i1 and j0 <= j <= j1 for i, j in self._cells)
@@ -0,0 +1,230 @@
+# app/core/http.py
+"""
+외부 HTTP 호출(Supabase REST, 기상청, 카카오)용 공용 클라이언트.
+
+requests.get() 같은 모듈 함수는 부를 때마다 새 세션이라 매번 TCP + TLS 연결을 새로 맺는다.
+여기서는 upstream 마다 Session 하나를 만들어 keep-alive 연결을 풀로 들고 있고,
+- 풀 크기(동시에 유지할 연결 수)는 upstream 별로 설정
+- timeout 은 (connect, read) 로 나눠서 기본값을 줌 (호출할 때 timeout= 으로 덮어쓸 수 있음)
+- GET/HEAD/PUT/DELETE/OPTIONS 처럼 여러 번 보내도 되는 요청만 연결 실패, 502/503/504 에서
+  backoff 를 두고 재시도한다 (POST/PATCH 는 재시도하지 않음)
+- read timeout 은 재시도하지 않는다. 멈춘 서버에 다시 보내면 호출 한 번이 read timeout 의 몇 배가 된다
+requests.Session 은 여러 스레드가 같이 써도 연결 풀(urllib3)은 스레드 안전하다.
+
+async 라우트(파티, 인증 의존성)는 이벤트 루프를 막지 않도록 같은 규칙의
+AsyncHttpClient(httpx.AsyncClient) 를 await 해서 쓴다.
+"""
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import (
+    HTTP_CONNECT_TIMEOUT_SEC,
+    HTTP_RETRIES,
+    HTTP_BACKOFF_SEC,
+    SUPABASE_HTTP_POOL_SIZE,
+    SUPABASE_HTTP_READ_TIMEOUT_SEC,
+    KMA_HTTP_POOL_SIZE,
+    KMA_HTTP_READ_TIMEOUT_SEC,
+    KAKAO_HTTP_POOL_SIZE,
+    KAKAO_HTTP_READ_TIMEOUT_SEC,
+)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+RETRY_STATUSES = (502, 503, 504)
+
+
+class HttpClient:
+    """upstream 하나용 keep-alive 세션. get/post/patch/delete 는 requests 와 같은 모양으로 Response 반환."""
+
+    def __init__(
+        self,
+        name: str,
+        pool_size: int,
+        connect_timeout: float,
+        read_timeout: float,
+        retries: int,
+        backoff_sec: float,
+    ) -> None:
+        self.name = name
+        self.pool_size = pool_size
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.requests = 0
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=False,  # 응답을 기다리다 끊긴 건 재시도 없이 ReadTimeout 그대로 (호출 시간이 read timeout 을 넘지 않게)
+            status=retries,
+            backoff_factor=backoff_sec,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False,  # 재시도가 끝나면 마지막 응답을 그대로 돌려줌 (호출부가 resp.ok 로 판단)
+            respect_retry_after_header=True,
+        )
+        # pool_block=False: 풀이 다 차면 기다리지 않고 임시 연결을 더 열어서 (다 쓰면 버림) 처리
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        self.requests += 1
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "pool_size": self.pool_size,
+            "timeout": self.timeout,
+            "requests": self.requests,
+        }
+
+
+class AsyncHttpClient:
+    """
+    HttpClient 의 async 판 (httpx.AsyncClient). 응답은 httpx.Response (성공 여부는 resp.is_success).
+    AsyncClient 는 처음 쓴 이벤트 루프에 묶이므로 처음 요청할 때 만들고, 종료 시 aclose() 로 닫는다.
+    풀이 다 차면 새 요청은 빈 연결이 날 때까지 기다린다 (최대 read timeout 만큼).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        pool_size: int,
+        connect_timeout: float,
+        read_timeout: float,
+        retries: int,
+        backoff_sec: float,
+    ) -> None:
+        self.name = name
+        self.pool_size = pool_size
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff_sec = backoff_sec
+        self.requests = 0
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            connect_timeout, read_timeout = self.timeout
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            )
+        return self._client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        client = self._get_client()
+        retries = self.retries if method in IDEMPOTENT_METHODS else 0
+        self.requests += 1
+        for attempt in range(retries + 1):
+            last = attempt == retries
+            try:
+                resp = await client.request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # 연결 자체가 안 된 경우만 재시도 (read timeout 등은 그대로 올림)
+                if last:
+                    raise
+            else:
+                if last or resp.status_code not in RETRY_STATUSES:
+                    return resp
+                await resp.aclose()
+            # urllib3 Retry 와 같은 backoff: backoff_sec * 2^(n-1), 첫 재시도는 바로
+            if attempt > 0:
+                await asyncio.sleep(self.backoff_sec * (2 ** (attempt - 1)))
+        raise AssertionError("unreachable")
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "pool_size": self.pool_size,
+            "timeout": self.timeout,
+            "requests": self.requests,
+            "open": self._client is not None,
+        }
+
+
+def _client(name: str, pool_size: int, read_timeout: float, retries: Optional[int] = None) -> HttpClient:
+    return HttpClient(
+        name=name,
+        pool_size=pool_size,
+        connect_timeout=HTTP_CONNECT_TIMEOUT_SEC,
+        read_timeout=read_timeout,
+        retries=HTTP_RETRIES if retries is None else retries,
+        backoff_sec=HTTP_BACKOFF_SEC,
+    )
+
+
+supabase_http = _client("supabase", SUPABASE_HTTP_POOL_SIZE, SUPABASE_HTTP_READ_TIMEOUT_SEC)
+# 기상청은 회로 차단기 / 마지막 관측값 재사용이 따로 있어서 여기서 오래 재시도하지 않는다
+kma_http = _client("kma", KMA_HTTP_POOL_SIZE, KMA_HTTP_READ_TIMEOUT_SEC, retries=1)
+kakao_http = _client("kakao", KAKAO_HTTP_POOL_SIZE, KAKAO_HTTP_READ_TIMEOUT_SEC)
+
+# async 라우트용 Supabase 클라이언트 (풀 크기 / timeout / 재시도 규칙은 supabase_http 와 같음)
+supabase_async_http = AsyncHttpClient(
+    name="supabase-async",
+    pool_size=SUPABASE_HTTP_POOL_SIZE,
+    connect_timeout=HTTP_CONNECT_TIMEOUT_SEC,
+    read_timeout=SUPABASE_HTTP_READ_TIMEOUT_SEC,
+    retries=HTTP_RETRIES,
+    backoff_sec=HTTP_BACKOFF_SEC,
+)
+
+_CLIENTS = (supabase_http, kma_http, kakao_http)
+_ASYNC_CLIENTS = (supabase_async_http,)
+
+
+def http_stats() -> Dict[str, Any]:
+    return {c.name: c.stats() for c in (*_CLIENTS, *_ASYNC_CLIENTS)}
+
+
+def close_all() -> None:
+    """종료 시 keep-alive 연결 정리."""
+    for c in _CLIENTS:
+        c.close()
+
+
+async def aclose_all() -> None:
+    for c in _ASYNC_CLIENTS:
+        await c.aclose()
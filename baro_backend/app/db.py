@@ -1,13 +1,54 @@
 # app/db.py
-import math
-import requests
-from typing import List, Optional, Dict, Any
-
-from .config import SUPABASE_URL, SUPABASE_ANON_KEY
+import logging
+import time
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Mapping, Tuple, TypeVar
+
+from .config import (
+    SUPABASE_URL,
+    SUPABASE_ANON_KEY,
+    FACILITY_SNAPSHOT_TTL_SEC,
+    FACILITY_STORE_PATH,
+    RECOMMEND_DEADLINE_SEC,
+    RECOMMEND_WEATHER_WAIT_SEC,
+    RECOMMEND_IO_WORKERS,
+    RECOMMEND_CACHE_CELL_M,
+    RECOMMEND_CACHE_TTL_SEC,
+    RECOMMEND_CACHE_SIZE,
+)
+from app.core.cache import TTLCache
+from app.core.http import supabase_http
+from app.core.geo import grid_cell
+from app.modules.bot.kma_grid import latlon_to_grid
+from app.modules.bot.forecast import indoor_only_during
 from app.modules.bot.weather import is_indoor_only
+from app.modules.facility.engine import ScoredFacilities, _norm
+from app.modules.facility.snapshot import (
+    FacilitySnapshot,
+    SnapshotStore,
+    build_facility_snapshot,
+)
+from app.modules.facility.store import load_facility_store
+
+logger = logging.getLogger(__name__)
 
 TABLE_NAME = "songpa_sports_data"
 
+T = TypeVar("T")
+
+# 추천 경로의 외부 호출(스냅샷 콜드 로드, 기상청)을 동시에 보내는 공용 스레드 풀
+_io_pool = ThreadPoolExecutor(
+    max_workers=RECOMMEND_IO_WORKERS,
+    thread_name_prefix="recommend-io",
+)
+
+
+def _result_before(future: "Future[T]", deadline: float) -> T:
+    """future 결과를 deadline(time.monotonic 기준)까지 기다림. 시간 초과면 FutureTimeoutError."""
+    return future.result(timeout=max(0.0, deadline - time.monotonic()))
+
 # ------------------ 공통 요청 헤더 ------------------ #
 def _base_headers() -> Dict[str, str]:
     return {
@@ -22,30 +63,13 @@ def _fetch_all_facilities() -> list[dict]:
     params = {
         "select": "faci_cd,faci_nm,faci_addr,faci_lat,faci_lot,ftype_nm,inout_gbn_nm"
     }
-    resp = requests.get(url, params=params, headers=_base_headers(), timeout=10)
+    resp = supabase_http.get(url, params=params, headers=_base_headers())
     if not resp.ok:
         raise RuntimeError(f"Supabase 요청 실패: {resp.status_code} - {resp.text}")
     return resp.json()
 
 
-def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 6371.0  # km
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(
-        dlambda / 2
-    ) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
-
 # ------------------ 문자열 / 나이 band helper ------------------ #
-def _norm(text: str) -> str:
-    return (text or "").replace(" ", "").lower()
-
-
 def _age_to_band(age: int) -> str:
     if age < 20:
         return "10대"
@@ -63,11 +87,6 @@ def _age_to_band(age: int) -> str:
         return "70대 이상"
 
 
-def _match_sport(main_text: str, sport_name: str) -> bool:
-    """ftype_nm 안에 특정 종목명이 포함되는지 (공백 제거 후 부분문자열 매칭)."""
-    return _norm(sport_name) in _norm(main_text)
-
-
 # ------------------ exercise_methods (강도) 조회 ------------------ #
 def _fetch_exercise_methods() -> Dict[str, str]:
     """
@@ -75,7 +94,7 @@ def _fetch_exercise_methods() -> Dict[str, str]:
     """
     url = f"{SUPABASE_URL}/rest/v1/exercise_methods"
     params = {"select": "sports_nm,intensity"}
-    resp = requests.get(url, params=params, headers=_base_headers(), timeout=10)
+    resp = supabase_http.get(url, params=params, headers=_base_headers())
     if not resp.ok:
         raise RuntimeError(f"Supabase exercise_methods 실패: {resp.status_code} - {resp.text}")
     rows = resp.json()
@@ -89,32 +108,118 @@ def _fetch_exercise_methods() -> Dict[str, str]:
     return mapping
 
 # ------------------ sports_pref (연령/성별별 선호 종목) 조회 ------------------ #
-def _fetch_age_gender_pref_sports(age_band: str, gender: str) -> List[str]:
+def _fetch_sports_pref() -> Mapping[Tuple[str, str], Tuple[str, ...]]:
     """
-    sports_pref 테이블에서 해당 나이대 + 성별의 sports_nm 리스트 반환.
-    sports_nm은 '축구, 테니스, 야구' 형태라 split해서 리스트로 만듦.
+    sports_pref 테이블 전체를 (나이대, 성별) -> 정규화된 종목명 튜플 로 읽어옴.
+    sports_nm은 '축구, 테니스, 야구' 형태라 여기서 한 번만 split/정규화해 둔다.
     """
     url = f"{SUPABASE_URL}/rest/v1/sports_pref"
-    params = {
-        "select": "sports_nm",
-        "ages": f"eq.{age_band}",
-        "gender": f"eq.{gender}",
-    }
-    resp = requests.get(url, params=params, headers=_base_headers(), timeout=10)
+    params = {"select": "ages,gender,sports_nm"}
+    resp = supabase_http.get(url, params=params, headers=_base_headers())
     if not resp.ok:
         raise RuntimeError(f"Supabase sports_pref 실패: {resp.status_code} - {resp.text}")
     rows = resp.json()
-    if not rows:
-        return []
 
-    sports_set = set()
+    sports_by_key: Dict[Tuple[str, str], set] = {}
     for row in rows:
+        key = (row.get("ages"), row.get("gender"))
+        sports_set = sports_by_key.setdefault(key, set())
         s = row.get("sports_nm") or ""
         for sp in s.split(","):
-            sp = sp.strip()
+            sp = _norm(sp.strip())
             if sp:
                 sports_set.add(sp)
-    return list(sports_set)
+
+    return MappingProxyType(
+        {key: tuple(sorted(sports)) for key, sports in sports_by_key.items()}
+    )
+
+# ------------------ 시설 스냅샷 (메모리 캐시) ------------------ #
+def _load_facility_snapshot_from_supabase() -> FacilitySnapshot:
+    """
+    songpa_sports_data + exercise_methods + sports_pref 를 동시에 읽어서 스냅샷으로 묶음.
+    세 요청은 서로 독립이라 순서대로 기다리지 않는다.
+    (추천 요청용 _io_pool 안에서 불릴 수 있어서 로드 전용 풀을 따로 쓴다)
+    """
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="snapshot-load") as pool:
+        facilities = pool.submit(_fetch_all_facilities)
+        intensity_map = pool.submit(_fetch_exercise_methods)
+        sports_pref = pool.submit(_fetch_sports_pref)
+        return build_facility_snapshot(
+            facilities=facilities.result(),
+            intensity_map=intensity_map.result(),
+            sports_pref=sports_pref.result(),
+        )
+
+
+def _load_facility_snapshot() -> FacilitySnapshot:
+    """
+    FACILITY_STORE_PATH 에 로컬 시설 저장소가 있으면 그걸 메모리 맵으로 열고,
+    없거나 못 열면 Supabase 에서 내려받는다.
+    """
+    if FACILITY_STORE_PATH:
+        try:
+            return load_facility_store(FACILITY_STORE_PATH)
+        except Exception as e:
+            logger.warning(f"[snapshot] local facility store unavailable, using Supabase: {e}")
+    return _load_facility_snapshot_from_supabase()
+
+
+# 시설 테이블은 한 달에 한 번 바뀔까 말까라서 요청마다 내려받지 않고 메모리에서 서빙
+facility_snapshots: SnapshotStore[FacilitySnapshot] = SnapshotStore(
+    "facility",
+    _load_facility_snapshot,
+    ttl_sec=FACILITY_SNAPSHOT_TTL_SEC,
+)
+
+
+def invalidate_facility_snapshot() -> None:
+    """시설/운동강도/선호종목 데이터를 수정한 뒤 바로 반영하고 싶을 때 호출하는 훅."""
+    facility_snapshots.invalidate()
+    recommendation_cache.clear()
+
+
+# ------------------ 추천 결과 캐시 ------------------ #
+# 같은 아파트 단지에서 비슷한 프로필로 묻는 경우가 많아서,
+# 위치를 RECOMMEND_CACHE_CELL_M 격자로 묶은 키로 "후보 시설 목록"을 캐시한다.
+# 히트하면 그 후보들만 실제 사용자 위치 기준으로 다시 채점해서 거리는 항상 정확하다.
+RECOMMEND_CACHE_CANDIDATES = 3  # limit 의 몇 배만큼 후보를 들고 있을지
+
+recommendation_cache: TTLCache[tuple, Any] = TTLCache(
+    maxsize=RECOMMEND_CACHE_SIZE,
+    ttl_sec=RECOMMEND_CACHE_TTL_SEC,
+    name="recommendation",
+)
+
+
+def _recommendation_cache_key(
+    snapshot: FacilitySnapshot,
+    user_lat: float,
+    user_lon: float,
+    preferred_sports: Optional[List[str]],
+    age_band: Optional[str],
+    gender: Optional[str],
+    preferred_intensity: Optional[str],
+    indoor_only: bool,
+    limit: int,
+) -> tuple:
+    return (
+        snapshot.loaded_at,  # 스냅샷이 바뀌면 후보 위치도 달라지니까 키에 포함
+        grid_cell(user_lat, user_lon, RECOMMEND_CACHE_CELL_M / 1000),
+        age_band,
+        gender if age_band else None,  # 나이를 모르면 성별은 점수에 영향 없음
+        tuple(sorted({_norm(s) for s in (preferred_sports or [])})),
+        preferred_intensity,
+        indoor_only,
+        limit,
+    )
+
+
+def recommendation_cache_stats() -> Dict[str, Any]:
+    """셀 크기 튜닝용 추천 결과 캐시 히트/미스 통계."""
+    stats = recommendation_cache.stats()
+    stats["cell_m"] = RECOMMEND_CACHE_CELL_M
+    return stats
 
 def get_profiled_facilities(
     user_lat: float,
@@ -124,192 +229,179 @@ def get_profiled_facilities(
     gender: Optional[str] = None,                  # '남' 또는 '여'
     preferred_intensity: Optional[str] = None,     # '저', '중', '고' 중 하나
     limit: int = 5,
+    start: Optional[datetime] = None,              # 운동할 시간대 (없으면 지금 날씨 기준)
+    end: Optional[datetime] = None,
 ) -> List[Dict[str, Any]]:
     """
     거리 + 선호 스포츠 + 나이/성별 + 운동강도 + 연령별 선호스포츠를 반영한 추천.
+    채점은 스냅샷의 열 배열(FacilityColumns) 위에서 한 번에 벡터 연산으로 하고,
+    응답용 dict 는 최종 상위 limit 개에 대해서만 만든다.
+    start 를 주면 실내 여부는 현재 관측값 대신 [start, end] 시간대 예보로 정한다.
     """
 
-    facilities = _fetch_all_facilities()
-    intensity_map = _fetch_exercise_methods()
+    started = time.monotonic()
+    deadline = started + RECOMMEND_DEADLINE_SEC
+    weather_deadline = min(deadline, started + RECOMMEND_WEATHER_WAIT_SEC)
+
+    # 날씨 조회와 (스냅샷이 비어 있으면) 시설 데이터 로드를 동시에 보낸다
+    if start is None:
+        weather_future = _io_pool.submit(is_indoor_only, user_lat, user_lon)
+    else:
+        weather_future = _io_pool.submit(indoor_only_during, user_lat, user_lon, start, end)
+    if facility_snapshots.loaded:
+        snapshot = facility_snapshots.get()
+    else:
+        snapshot_future = _io_pool.submit(facility_snapshots.get)
+        try:
+            snapshot = _result_before(snapshot_future, deadline)
+        except FutureTimeoutError:
+            weather_future.cancel()
+            raise RuntimeError("시설 데이터를 제한 시간 안에 불러오지 못했습니다.")
+
     # 날씨 보고 실내만 추천해야 하는지 결정
-    indoor_only = is_indoor_only(user_lat, user_lon)
-    print(f"[recommend-debug] indoor_only={indoor_only}", flush=True)
+    # 기상청이 느리거나 실패하면 요청 전체를 붙잡지 않고 실내 필터 없이 진행
+    # 예보가 그 시간대를 못 덮으면(None: 키 없음, 너무 먼 미래, 장애) 지금 날씨 경로와 같이 필터 없이
+    try:
+        indoor_only = bool(_result_before(weather_future, weather_deadline))
+    except FutureTimeoutError:
+        logger.warning("[recommend] weather check timed out, skipping indoor filter")
+        weather_future.cancel()
+        indoor_only = False
+    except Exception as e:
+        logger.warning(f"[recommend] weather check failed, skipping indoor filter: {e}")
+        indoor_only = False
+    logger.debug("[recommend] indoor_only=%s", indoor_only)
 
     age_band: Optional[str] = None
-    age_gender_pref_sports: List[str] = []
+    age_gender_pref_sports: Tuple[str, ...] = ()
     if age is not None:
         age_band = _age_to_band(age)
     if age_band and gender:
-        age_gender_pref_sports = _fetch_age_gender_pref_sports(age_band, gender)
-
-    # 가중치 (1~6순위)
-    W_DIST = 0.2
-    W_PREF = 0.2
-    W_AGE = 0.2
-    W_GENDER = 0.2
-    W_INTENSITY = 0.05
-    W_AGE_SPORTS = 0.05
-
-    preferred_sports_norm = [
-        _norm(s) for s in (preferred_sports or [])
-    ]
-    age_gender_pref_norm = [_norm(s) for s in age_gender_pref_sports]
-
-    results: List[Dict[str, Any]] = []
-
-    for row in facilities:
-        if indoor_only and row.get("inout_gbn_nm") != "실내":
-            continue
-        try:
-            faci_lat = float(row["faci_lat"])
-            faci_lon = float(row["faci_lot"])
-        except (TypeError, ValueError):
-            continue
-
-        ftype_nm = row.get("ftype_nm") or ""
-        distance_km = _haversine(user_lat, user_lon, faci_lat, faci_lon)
-
-        # 1) 거리 점수 (0~1)
-        D_MAX = 5.0  # 5km까지 유효
-        dist_score = max(0.0, (D_MAX - distance_km) / D_MAX)
-
-        # 2) 선호 스포츠 점수
-        pref_score = 0.0
-        if preferred_sports_norm:
-            for sp in preferred_sports_norm:
-                if sp in _norm(ftype_nm):
-                    pref_score = 1.0
-                    break
-
-        # 3) 나이/성별 기반 (sports_pref)
-        age_score = 0.0
-        gender_score = 0.0
-        age_sports_score = 0.0
-
-        if age_gender_pref_norm:
-            for sp in age_gender_pref_norm:
-                if sp in _norm(ftype_nm):
-                    # 같은 sports_pref 세트를 기반으로 하지만
-                    # 가중치를 다르게 줘서 우선순위 차이를 둔다
-                    age_score = 1.0
-                    gender_score = 1.0
-                    age_sports_score = 1.0
-                    break
-
-        # 5) 운동 강도 일치 여부 (exercise_methods)
-        intensity_score = 0.0
-        if preferred_intensity:
-            facility_intensity = None
-            for sports_key, inten in intensity_map.items():
-                if sports_key in _norm(ftype_nm):
-                    facility_intensity = inten
-                    break
-            if facility_intensity and facility_intensity == preferred_intensity:
-                intensity_score = 1.0
-
-        total_score = (
-            W_DIST * dist_score
-            + W_PREF * pref_score
-            + W_AGE * age_score
-            + W_GENDER * gender_score
-            + W_INTENSITY * intensity_score
-            + W_AGE_SPORTS * age_sports_score
+        age_gender_pref_sports = snapshot.sports_pref.get((age_band, gender), ())
+
+    cache_key = _recommendation_cache_key(
+        snapshot, user_lat, user_lon, preferred_sports,
+        age_band, gender, preferred_intensity, indoor_only, limit,
+    )
+    candidates = recommendation_cache.get(cache_key)
+    if candidates is not None:
+        scored = snapshot.columns.rescore(
+            candidates,
+            user_lat,
+            user_lon,
+            preferred_sports=preferred_sports or [],
+            age_gender_pref_sports=age_gender_pref_sports,
+            preferred_intensity=preferred_intensity,
+            limit=limit,
         )
-
-        results.append(
-            {
-                "faci_cd": row["faci_cd"],
-                "faci_nm": row["faci_nm"],
-                "faci_addr": row["faci_addr"],
-                "ftype_nm": row["ftype_nm"],
-                "inout_gbn_nm": row["inout_gbn_nm"],
-                "faci_lat": faci_lat,
-                "faci_lot": faci_lon,
-                "distance_km": round(distance_km, 2),
-                "score": round(total_score, 3),
-                "detail_scores": {
-                    "distance": round(dist_score, 3),
-                    "preferred_sport": pref_score,
-                    "age": age_score,
-                    "gender": gender_score,
-                    "intensity": intensity_score,
-                    "age_sports": age_sports_score,
-                },
-            }
+    else:
+        # 후보는 limit 보다 넉넉히 뽑아서 캐시해 두고, 응답은 그중 상위 limit 개만
+        candidates_scored = snapshot.columns.score(
+            user_lat,
+            user_lon,
+            preferred_sports=preferred_sports or [],
+            age_gender_pref_sports=age_gender_pref_sports,
+            preferred_intensity=preferred_intensity,
+            indoor_only=indoor_only,
+            limit=limit * RECOMMEND_CACHE_CANDIDATES,
         )
+        recommendation_cache.set(cache_key, candidates_scored.pos)
+        scored = candidates_scored.top(limit)
 
-    # 점수 높은 순으로 정렬
-    results.sort(key=lambda x: x["score"], reverse=True)
     return {
         "indoor_only": indoor_only,
-        "facilities": results[:limit],
+        "facilities": _scored_to_results(snapshot, scored),
     }
 
-# sample 스키마(파티 테이블용) 헤더
-def _sample_headers() -> Dict[str, str]:
-    return {
-        "apikey": SUPABASE_ANON_KEY,
-        "Authorization": f"Bearer {SUPABASE_ANON_KEY}",
-        "Accept-Profile": "sample",      # Supabase 좌측 상단 schema 이름
-    }
 
-# ------------------ 파티 정보 조회 ------------------ #
-def get_nearby_parties(
-    user_lat: float,
-    user_lon: float,
-    max_distance_km: float = 5.0,
+def get_profiled_facilities_batch(
+    profiles: List[Dict[str, Any]],
     limit: int = 5,
 ) -> List[Dict[str, Any]]:
     """
-    Supabase sample.parties 테이블에서
-    사용자 근처에서 모집 중인 파티를 거리순으로 반환.
+    여러 사용자 추천을 한 번에 계산 (홈 화면 "나를 위한 시설" 카드 미리 만들기용).
+    profiles 의 각 dict 는 get_profiled_facilities 인자와 같은 키를 쓴다
+    (user_lat, user_lon, preferred_sports, age, gender, preferred_intensity).
+    - 시설 스냅샷은 한 번만 가져옴
+    - 날씨는 기상청 격자(nx, ny)마다 한 번씩만 동시에 조회
+    - 채점은 같은 스냅샷으로 사용자마다 FacilityColumns.score
+      ((사용자 x 시설) 행렬로 묶는 것보다 사용자별 반경 후보만 보는 쪽이 빨랐음)
+    결과는 profiles 순서대로 get_profiled_facilities 와 같은 모양.
     """
+    if not profiles:
+        return []
 
-    url = f"{SUPABASE_URL}/rest/v1/parties"
-    params = {
-        # 필요 컬럼만 골라서 가져오기
-        "select": "id,title,sports_nm,place,lat,lon,date,start_time,end_time,max_members,notes,status",
-        "status": "eq.recruiting",  # 모집 중인 파티만
-    }
+    started = time.monotonic()
+    deadline = started + RECOMMEND_DEADLINE_SEC
 
-    resp = requests.get(url, params=params, headers=_sample_headers(), timeout=10)
-    if not resp.ok:
-        raise RuntimeError(f"Supabase parties 요청 실패: {resp.status_code} - {resp.text}")
+    cells = [latlon_to_grid(p["user_lat"], p["user_lon"]) for p in profiles]
+    weather_futures: Dict[Tuple[int, int], Future] = {}
+    for p, cell in zip(profiles, cells):
+        if cell not in weather_futures:
+            weather_futures[cell] = _io_pool.submit(is_indoor_only, p["user_lat"], p["user_lon"])
 
-    rows = resp.json()
+    snapshot = facility_snapshots.get()
 
-    results: List[Dict[str, Any]] = []
-    for row in rows:
+    indoor_by_cell: Dict[Tuple[int, int], bool] = {}
+    for cell, future in weather_futures.items():
         try:
-            party_lat = float(row["lat"])
-            party_lon = float(row["lon"])
-        except (TypeError, ValueError):
-            continue
-
-        distance_km = _haversine(user_lat, user_lon, party_lat, party_lon)
+            indoor_by_cell[cell] = _result_before(future, deadline)
+        except Exception as e:
+            logger.warning(f"[recommend-batch] weather check failed for {cell}, skipping indoor filter: {e}")
+            future.cancel()
+            indoor_by_cell[cell] = False
+
+    age_pref: List[Tuple[str, ...]] = []
+    for p in profiles:
+        age = p.get("age")
+        age_band = _age_to_band(age) if age is not None else None
+        gender = p.get("gender")
+        age_pref.append(snapshot.sports_pref.get((age_band, gender), ()) if age_band and gender else ())
+
+    indoor = [indoor_by_cell[cell] for cell in cells]
+    scored = [
+        snapshot.columns.score(
+            p["user_lat"],
+            p["user_lon"],
+            preferred_sports=p.get("preferred_sports") or [],
+            age_gender_pref_sports=pref,
+            preferred_intensity=p.get("preferred_intensity"),
+            indoor_only=indoor_only,
+            limit=limit,
+        )
+        for p, pref, indoor_only in zip(profiles, age_pref, indoor)
+    ]
+    return [
+        {"indoor_only": indoor_only, "facilities": _scored_to_results(snapshot, s)}
+        for indoor_only, s in zip(indoor, scored)
+    ]
 
-        # 너무 먼 파티는 제외 (예: 5km 이상)
-        if distance_km > max_distance_km:
-            continue
 
+def _scored_to_results(snapshot: FacilitySnapshot, scored: ScoredFacilities) -> List[Dict[str, Any]]:
+    """채점 결과 배열 -> 응답용 dict 리스트 (점수 높은 순 그대로)."""
+    results: List[Dict[str, Any]] = []
+    for i in range(len(scored)):
+        row = snapshot.facilities[int(scored.row[i])]
+        age_sports_score = float(scored.age_sports_score[i])
         results.append(
             {
-                "id": row["id"],
-                "title": row.get("title"),
-                "sports_nm": row.get("sports_nm"),
-                "place": row.get("place"),
-                "lat": party_lat,
-                "lon": party_lon,
-                "date": row.get("date"),
-                "start_time": row.get("start_time"),
-                "end_time": row.get("end_time"),
-                "max_members": row.get("max_members"),
-                "notes": row.get("notes"),
-                "status": row.get("status"),
-                "distance_km": round(distance_km, 2),
+                "faci_cd": row["faci_cd"],
+                "faci_nm": row["faci_nm"],
+                "faci_addr": row["faci_addr"],
+                "ftype_nm": row["ftype_nm"],
+                "inout_gbn_nm": row["inout_gbn_nm"],
+                "faci_lat": float(row["faci_lat"]),
+                "faci_lot": float(row["faci_lot"]),
+                "distance_km": round(float(scored.distance_km[i]), 2),
+                "score": round(float(scored.total_score[i]), 3),
+                "detail_scores": {
+                    "distance": round(float(scored.dist_score[i]), 3),
+                    "preferred_sport": float(scored.pref_score[i]),
+                    "age": age_sports_score,
+                    "gender": age_sports_score,
+                    "intensity": float(scored.intensity_score[i]),
+                    "age_sports": age_sports_score,
+                },
             }
         )
-
-    # 거리 가까운 순서로 정렬
-    results.sort(key=lambda x: x["distance_km"])
-    return results[:limit]
\ No newline at end of file
+    return results
@@ -1,4 +1,8 @@
-from fastapi import FastAPI
+import hmac
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import Depends, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
 # 모듈별 라우터 임포트
@@ -7,10 +11,47 @@ from app.modules.bot.router import router as bot_router
 from app.modules.party.router import router as party_router
 from app.modules.message.router import router as message_router
 
+from app.config import INTERNAL_API_TOKEN, PARTY_INDEX_REBUILD_SEC
+from app.core.http import aclose_all as aclose_async_http_clients, close_all as close_http_clients, http_stats
+from app.db import facility_snapshots, recommendation_cache_stats
+from app.modules.auth.service import (
+    kakao_token_cache,
+    revoked_tokens,
+    user_profile_cache,
+    verified_tokens,
+)
+from app.modules.bot.forecast import forecast_cache
+from app.modules.bot.weather import (
+    observation_cache,
+    observation_flight,
+    weather_breaker,
+    weather_prefetcher,
+)
+from app.modules.party.index import party_index
+from app.modules.party.repository import PartyRepository
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시설 스냅샷: 시작할 때 한 번 로드하고 이후 주기적으로 백그라운드 갱신
+    facility_snapshots.start()
+    # 모집 중 파티 위치 인덱스: 쓰기 때마다 바로 반영 + 주기적으로 DB 에서 다시 만듦
+    party_index.start(PartyRepository().list_open_party_rows, rebuild_sec=PARTY_INDEX_REBUILD_SEC)
+    # 날씨: 최근 요청 있던 격자는 매시 발표 직후 미리 받아 둠
+    weather_prefetcher.start()
+    yield
+    weather_prefetcher.stop()
+    party_index.stop()
+    facility_snapshots.stop()
+    close_http_clients()
+    await aclose_async_http_clients()
+
+
 app = FastAPI(
     title="Baro Backend API",
     version="0.1.0",
-    description="Baro 운동 추천 앱을 위한 백엔드 API"
+    description="Baro 운동 추천 앱을 위한 백엔드 API",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -31,4 +72,37 @@ app.include_router(message_router)
 
 @app.get("/")
 def health_check():
-    return {"status": "ok", "message": "Baro Server is Running"}
\ No newline at end of file
+    return {"status": "ok", "message": "Baro Server is Running"}
+
+
+def require_internal_token(x_internal_token: Optional[str] = Header(None)) -> None:
+    # 토큰을 설정 안 했으면 /internal/* 은 없는 것처럼 404, 틀리면 401
+    if not INTERNAL_API_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_internal_token is None or not hmac.compare_digest(
+        x_internal_token.encode(), INTERNAL_API_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid internal token")
+
+
+@app.get("/internal/cache-stats", dependencies=[Depends(require_internal_token)])
+def cache_stats():
+    # 추천 결과 캐시 적중률 확인용 (격자 크기 튜닝할 때 봄)
+    return {
+        "recommendation": recommendation_cache_stats(),
+        "weather": observation_cache.stats(),
+        "weather_single_flight": observation_flight.stats(),
+        "weather_breaker": weather_breaker.stats(),
+        "forecast": forecast_cache.stats(),
+        "user_profile": user_profile_cache.stats(),
+        "jwt_verified": verified_tokens.stats(),
+        "jwt_revoked": revoked_tokens.stats(),
+        "kakao_token": kakao_token_cache.stats(),
+        "http": http_stats(),
+    }
+
+
+@app.get("/internal/weather-prefetch", dependencies=[Depends(require_internal_token)])
+def weather_prefetch_status():
+    # 격자별 마지막 요청 / 미리 받기 시각과 결과
+    return weather_prefetcher.status()
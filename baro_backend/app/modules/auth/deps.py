@@ -2,7 +2,7 @@
 from fastapi import Header, HTTPException, status, Depends
 from uuid import UUID
 
-from .service import verify_jwt_token, _get_user_row_by_id, _row_to_auth_user
+from .service import verify_jwt_token, _get_user_row_by_id_async, _row_to_auth_user
 from .schemas import AuthUser
 
 
@@ -36,9 +36,9 @@ async def get_current_auth_user(
             detail="Invalid or expired token",
         )
 
-    # 2) Supabase user_profile 에서 row 가져오기
+    # 2) Supabase user_profile 에서 row 가져오기 (이벤트 루프를 막지 않게 async 로)
     try:
-        user_row = _get_user_row_by_id(user_id)
+        user_row = await _get_user_row_by_id_async(user_id)
     except KeyError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,70 @@
+# app/modules/auth/loader.py
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional
+
+from .service import _get_user_rows_by_ids, _get_user_rows_by_ids_async
+
+ProfileRow = Dict[str, Any]
+
+
+class ProfileLoader:
+    """
+    요청 하나 동안 쓰는 user_profile 배치 로더 (DataLoader 방식).
+    - 같은 이벤트 루프 틱 안에 load()/load_many() 로 들어온 uuid 를 모아서
+      프로필 캐시 -> 없는 것만 in.(...) 쿼리 한 번으로 읽는다
+    - 한 번 읽은 uuid 는 이 로더 안에서 다시 묻지 않음 (없는 유저도 None 으로 기억)
+    서비스/리포지토리를 요청마다 새로 만드는 구조라 로더도 그 인스턴스에 붙여서 쓴다.
+    """
+
+    def __init__(self) -> None:
+        self._rows: Dict[str, Optional[ProfileRow]] = {}
+        self._pending: Dict[str, "asyncio.Future[Optional[ProfileRow]]"] = {}
+        self._dispatch: Optional["asyncio.Task[None]"] = None
+        self.batches = 0
+
+    async def load(self, user_id: str) -> Optional[ProfileRow]:
+        key = str(user_id)
+        if key in self._rows:
+            return self._rows[key]
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if self._dispatch is None:
+                # 지금 틱에서 같이 들어오는 load() 들을 모은 뒤 한 번에 보냄
+                self._dispatch = loop.create_task(self._run_batch())
+        return await future
+
+    async def load_many(self, user_ids: Iterable[str]) -> Dict[str, ProfileRow]:
+        keys = list(dict.fromkeys(str(u) for u in user_ids))
+        rows = await asyncio.gather(*(self.load(k) for k in keys))
+        return {k: row for k, row in zip(keys, rows) if row is not None}
+
+    async def _run_batch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._dispatch = None
+        try:
+            self.batches += 1
+            found = await _get_user_rows_by_ids_async(pending)
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in pending.items():
+            row = found.get(key)
+            self._rows[key] = row
+            if not future.done():
+                future.set_result(row)
+
+    def load_many_sync(self, user_ids: Iterable[str]) -> Dict[str, ProfileRow]:
+        """동기 코드(스레드 풀에서 도는 라우트)용. 호출 한 번 = 모르는 uuid 에 대해 쿼리 한 번."""
+        keys = list(dict.fromkeys(str(u) for u in user_ids))
+        missing: List[str] = [k for k in keys if k not in self._rows]
+        if missing:
+            self.batches += 1
+            found = _get_user_rows_by_ids(missing)
+            for key in missing:
+                self._rows[key] = found.get(key)
+        return {k: self._rows[k] for k in keys if self._rows.get(k) is not None}
@@ -15,6 +15,7 @@ from app.modules.auth.service import (
     login_with_kakao,
     create_jwt_token,
     verify_jwt_token,
+    revoke_jwt_token,
     sign_up,
     update_profile,
     get_user,
@@ -101,8 +102,13 @@ def sign_up_endpoint(
 
 
 @auth_router.post("/logout")
-def logout(user_id: UUID = Depends(get_current_user_id)):
-    
+def logout(
+    user_id: UUID = Depends(get_current_user_id),
+    token: str = Depends(oauth2_scheme),
+):
+    # 이 토큰은 만료 전이라도 더 이상 받지 않음 (이 서버 프로세스 기준, best-effort)
+    if not revoke_jwt_token(token):
+        raise HTTPException(status_code=503, detail="Logout is temporarily unavailable")
     return {"detail": "logged out"}
 
 
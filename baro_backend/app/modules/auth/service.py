@@ -1,25 +1,37 @@
 # app/modules/auth/service.py
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta, timezone, date
-from typing import Dict, Optional, Any, List, Tuple
+from typing import Dict, Iterable, Optional, Any, List, Tuple
 from uuid import UUID
 
-import requests
 from jose import jwt, JWTError
 
+from app.core.cache import ExpiringSet, TTLCache
+from app.core.http import kakao_http, supabase_async_http, supabase_http
+
 from .schemas import AuthUser, SignUpRequestDto, ProfileUpdateRequestDto
 from app.config import (
     SUPABASE_URL,
     SUPABASE_ANON_KEY,
     SUPABASE_AUTH_SCHEMA,
     SUPABASE_USERS_TABLE,   
+    USER_PROFILE_CACHE_TTL_SEC,
+    USER_PROFILE_CACHE_SIZE,
 )
 from app.config_auth import (
     JWT_SECRET_KEY,
     JWT_ALGORITHM,
     JWT_EXPIRE_DAYS,
+    JWT_VERIFY_CACHE_SIZE,
+    JWT_REVOKED_SIZE,
     KAKAO_USERINFO_URL,
+    KAKAO_TOKEN_CACHE_TTL_SEC,
+    KAKAO_TOKEN_CACHE_SIZE,
 )
 
 # ============================================================
@@ -37,7 +49,7 @@ def _sb_headers() -> Dict[str, str]:
 
 def _sb_get(table: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
     url = f"{SUPABASE_URL}/rest/v1/{table}"
-    resp = requests.get(url, params=params, headers=_sb_headers(), timeout=10)
+    resp = supabase_http.get(url, params=params, headers=_sb_headers())
     if not resp.ok:
         raise RuntimeError(f"Supabase GET 실패: {resp.status_code} - {resp.text}")
     return resp.json()
@@ -47,19 +59,34 @@ def _sb_post(table: str, body: Dict[str, Any]) -> Dict[str, Any]:
     url = f"{SUPABASE_URL}/rest/v1/{table}"
     headers = _sb_headers()
     headers["Prefer"] = "return=representation"
-    resp = requests.post(url, json=body, headers=headers, timeout=10)
+    resp = supabase_http.post(url, json=body, headers=headers)
     if not resp.ok:
         raise RuntimeError(f"Supabase POST 실패: {resp.status_code} - {resp.text}")
     data = resp.json()
     return data[0] if data else {}
 
 
+def _sb_insert_ignore(table: str, body: Dict[str, Any], on_conflict: str) -> Optional[Dict[str, Any]]:
+    """
+    on_conflict 컬럼(unique) 기준으로 없을 때만 insert.
+    새로 넣었으면 그 row, 이미 있어서 무시됐으면 None (기존 row 는 건드리지 않음).
+    """
+    url = f"{SUPABASE_URL}/rest/v1/{table}"
+    headers = _sb_headers()
+    headers["Prefer"] = "resolution=ignore-duplicates,return=representation"
+    resp = supabase_http.post(url, params={"on_conflict": on_conflict}, json=body, headers=headers)
+    if not resp.ok:
+        raise RuntimeError(f"Supabase UPSERT 실패: {resp.status_code} - {resp.text}")
+    data = resp.json()
+    return data[0] if data else None
+
+
 def _sb_patch(table: str, match: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
     url = f"{SUPABASE_URL}/rest/v1/{table}"
     params = match.copy()
     headers = _sb_headers()
     headers["Prefer"] = "return=representation"
-    resp = requests.patch(url, params=params, json=body, headers=headers, timeout=10)
+    resp = supabase_http.patch(url, params=params, json=body, headers=headers)
     if not resp.ok:
         raise RuntimeError(f"Supabase PATCH 실패: {resp.status_code} - {resp.text}")
     data = resp.json()
@@ -69,21 +96,69 @@ def _sb_patch(table: str, match: Dict[str, str], body: Dict[str, Any]) -> Dict[s
 def _sb_delete(table: str, match: Dict[str, str]) -> None:
     url = f"{SUPABASE_URL}/rest/v1/{table}"
     params = match.copy()
-    resp = requests.delete(url, params=params, headers=_sb_headers(), timeout=10)
+    resp = supabase_http.delete(url, params=params, headers=_sb_headers())
     if not resp.ok:
         raise RuntimeError(f"Supabase DELETE 실패: {resp.status_code} - {resp.text}")
 
 
+# async 라우트 / 의존성용. 같은 요청을 이벤트 루프를 막지 않고 보낸다 (응답은 httpx.Response)
+async def _sb_get_async(table: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    url = f"{SUPABASE_URL}/rest/v1/{table}"
+    resp = await supabase_async_http.get(url, params=params, headers=_sb_headers())
+    if not resp.is_success:
+        raise RuntimeError(f"Supabase GET 실패: {resp.status_code} - {resp.text}")
+    return resp.json()
+
+
+async def _sb_post_async(table: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    url = f"{SUPABASE_URL}/rest/v1/{table}"
+    headers = _sb_headers()
+    headers["Prefer"] = "return=representation"
+    resp = await supabase_async_http.post(url, json=body, headers=headers)
+    if not resp.is_success:
+        raise RuntimeError(f"Supabase POST 실패: {resp.status_code} - {resp.text}")
+    data = resp.json()
+    return data[0] if data else {}
+
+
+async def _sb_patch_async(table: str, match: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+    url = f"{SUPABASE_URL}/rest/v1/{table}"
+    params = match.copy()
+    headers = _sb_headers()
+    headers["Prefer"] = "return=representation"
+    resp = await supabase_async_http.patch(url, params=params, json=body, headers=headers)
+    if not resp.is_success:
+        raise RuntimeError(f"Supabase PATCH 실패: {resp.status_code} - {resp.text}")
+    data = resp.json()
+    return data[0] if data else {}
+
+
+async def _sb_delete_async(table: str, match: Dict[str, str]) -> None:
+    url = f"{SUPABASE_URL}/rest/v1/{table}"
+    params = match.copy()
+    resp = await supabase_async_http.delete(url, params=params, headers=_sb_headers())
+    if not resp.is_success:
+        raise RuntimeError(f"Supabase DELETE 실패: {resp.status_code} - {resp.text}")
+
+
 # ============================================================
 # Kakao API
 # ============================================================
 
+# sha256(카카오 access token) -> (kakao_id, 닉네임). 같은 토큰으로 다시 로그인하면 카카오 호출 생략
+kakao_token_cache: TTLCache[bytes, Tuple[str, Optional[str]]] = TTLCache(
+    maxsize=KAKAO_TOKEN_CACHE_SIZE,
+    ttl_sec=KAKAO_TOKEN_CACHE_TTL_SEC,
+    name="kakao-token",
+)
+
+
 def get_kakao_profile(access_token: str) -> dict:
     """
     카카오 access token으로 /v2/user/me 호출해서 프로필 가져오기.
     """
     headers = {"Authorization": f"Bearer {access_token}"}
-    resp = requests.get(KAKAO_USERINFO_URL, headers=headers, timeout=5)
+    resp = kakao_http.get(KAKAO_USERINFO_URL, headers=headers)
     if not resp.ok:
         raise ValueError(f"Kakao API error: {resp.status_code} - {resp.text}")
     return resp.json()
@@ -103,41 +178,210 @@ def create_jwt_token(user_id: UUID) -> str:
     return token
 
 
+# 토큰 sha256 -> (user_id, exp). 한 번 검증한 토큰은 자기 만료 시각까지 서명 검증을 건너뜀
+verified_tokens: TTLCache[bytes, Tuple[UUID, float]] = TTLCache(
+    maxsize=JWT_VERIFY_CACHE_SIZE,
+    ttl_sec=JWT_EXPIRE_DAYS * 24 * 60 * 60,
+    name="jwt-verified",
+)
+# 로그아웃한 토큰 sha256. 토큰이 어차피 만료되는 시각까지 들고 있고, 그 전에는 절대 빼지 않는다
+# (LRU 로 밀려나면 그 토큰이 다시 통과하므로). 가득 차면 새 로그아웃을 거부한다.
+# 이 프로세스 메모리에만 있어서 다른 워커 / 재시작 후에는 적용되지 않는다 (best-effort 로그아웃).
+revoked_tokens: ExpiringSet[bytes] = ExpiringSet(maxsize=JWT_REVOKED_SIZE, name="jwt-revoked")
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
 def verify_jwt_token(token: str) -> UUID:
+    digest = _token_digest(token)
+    if digest in revoked_tokens:
+        raise ValueError("Revoked token")
+    cached = verified_tokens.get(digest)
+    if cached is not None:
+        return cached[0]
+
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
         sub = payload.get("sub")
         if sub is None:
             raise JWTError("No sub")
-        return UUID(sub)
+        user_id = UUID(sub)
     except JWTError as e:
         raise ValueError("Invalid token") from e
 
+    # exp 없는 토큰은 언제까지 믿을지 모르니 캐시하지 않음
+    exp = payload.get("exp")
+    if exp is not None:
+        ttl = float(exp) - time.time()
+        if ttl > 0:
+            verified_tokens.set(digest, (user_id, float(exp)), ttl_sec=ttl)
+    return user_id
+
+
+def revoke_jwt_token(token: str) -> bool:
+    """
+    로그아웃: 검증 캐시에서 빼고, 토큰 만료 시각까지 거부 목록에 올림.
+    이 프로세스에만 적용되는 best-effort 로그아웃 (다른 워커는 토큰 만료 시각까지 계속 받음).
+    거부 목록이 만료 전 토큰으로 가득 차서 못 올렸으면 False.
+    """
+    digest = _token_digest(token)
+    cached = verified_tokens.get(digest)
+    verified_tokens.pop(digest)
+    if cached is not None:
+        exp: Optional[float] = cached[1]
+    else:
+        try:
+            exp = jwt.get_unverified_claims(token).get("exp")
+        except JWTError:
+            exp = None
+    ttl = float(exp) - time.time() if exp is not None else None
+    if ttl is not None and ttl <= 0:
+        return True  # 이미 만료된 토큰은 어차피 검증에서 걸림
+    return revoked_tokens.add(digest, ttl_sec=ttl)
+
 
 # ============================================================
 # Supabase user_profile 접근 함수
 # ============================================================
 
-def _get_user_row_by_kakao(kakao_id: str) -> Optional[Dict[str, Any]]:
+# uuid -> user_profile row. 인증 의존성이 요청마다 읽는 값이라 짧게 캐시하고,
+# 이 프로세스에서 프로필을 바꾸는 곳(sign_up / update_profile / delete_user / 매너온도 갱신)은 바로 비운다
+user_profile_cache: TTLCache[UUID, Dict[str, Any]] = TTLCache(
+    maxsize=USER_PROFILE_CACHE_SIZE,
+    ttl_sec=USER_PROFILE_CACHE_TTL_SEC,
+    name="user-profile",
+)
+
+
+# 비운 횟수. 조회가 끝나기 전에 누가 비웠으면(= 그 사이 수정됨) 조회 결과를 캐시에 넣지 않는다.
+# 증가 + 비우기, 비교 + 넣기를 각각 한 번에 해야 해서 락으로 묶는다
+_profile_generation = 0
+_profile_generation_lock = threading.Lock()
+
+
+def invalidate_user_profile(user_id: UUID | str) -> None:
+    global _profile_generation
+    with _profile_generation_lock:
+        _profile_generation += 1
+        user_profile_cache.pop(UUID(str(user_id)))
+
+
+def _cache_user_row(user_id: UUID, row: Dict[str, Any], generation: int) -> None:
+    with _profile_generation_lock:
+        if generation == _profile_generation:
+            user_profile_cache.set(user_id, row)
+
+
+def _user_by_id_params(user_id: UUID) -> Dict[str, Any]:
+    return {
+        "select": "uuid,kakao_id,nickname,birth_date,gender,height,weight,"
+                  "muscle_mass,skill_level,favorite_sports,sportsmanship,"
+                  "latitude,longitude",
+        "uuid": f"eq.{user_id}",
+        "limit": 1,
+    }
+
+
+def _get_user_row_by_id(user_id: UUID) -> Dict[str, Any]:
     """
-    kakao_id 로 user_profile 에서 한 명 조회
+    uuid 로 user_profile 에서 한 명 조회
     """
-    rows = _sb_get(
-        SUPABASE_USERS_TABLE,
-        {
-            "select": "uuid,kakao_id,nickname,birth_date,gender,height,weight,"
-                      "muscle_mass,skill_level,favorite_sports,sportsmanship,"
-                      "latitude,longitude",
-            "kakao_id": f"eq.{kakao_id}",
-            "limit": 1,
-        },
+    row = user_profile_cache.get(user_id)
+    if row is not None:
+        return row
+    generation = _profile_generation
+    rows = _sb_get(SUPABASE_USERS_TABLE, _user_by_id_params(user_id))
+    if not rows:
+        raise KeyError("user not found")
+    _cache_user_row(user_id, rows[0], generation)
+    return rows[0]
+
+
+async def _get_user_row_by_id_async(user_id: UUID) -> Dict[str, Any]:
+    """_get_user_row_by_id 의 async 판 (인증 의존성에서 씀)"""
+    row = user_profile_cache.get(user_id)
+    if row is not None:
+        return row
+    generation = _profile_generation
+    rows = await _sb_get_async(SUPABASE_USERS_TABLE, _user_by_id_params(user_id))
+    if not rows:
+        raise KeyError("user not found")
+    _cache_user_row(user_id, rows[0], generation)
+    return rows[0]
+
+
+# 여러 명 한 번에 조회할 때 in.(...) 한 쿼리에 넣는 최대 uuid 수 (URL 길이 제한)
+_USER_BATCH_SIZE = 200
+
+
+def _split_cached_user_rows(
+    user_ids: Iterable[str],
+) -> Tuple[Dict[str, Dict[str, Any]], List[UUID]]:
+    """프로필 캐시에 있는 row 와 DB 에서 읽어야 할 uuid 로 나눔 (uuid 가 아닌 값은 버림)."""
+    found: Dict[str, Dict[str, Any]] = {}
+    missing: List[UUID] = []
+    for raw in dict.fromkeys(str(u) for u in user_ids):
+        try:
+            uid = UUID(raw)
+        except ValueError:
+            continue
+        row = user_profile_cache.get(uid)
+        if row is not None:
+            found[raw] = row
+        else:
+            missing.append(uid)
+    return found, missing
+
+
+def _users_by_ids_params(user_ids: List[UUID]) -> Dict[str, Any]:
+    params = _user_by_id_params(user_ids[0])
+    params["uuid"] = f"in.({','.join(str(u) for u in user_ids)})"
+    params.pop("limit")
+    return params
+
+
+def _store_user_rows(
+    found: Dict[str, Dict[str, Any]],
+    rows: Iterable[Dict[str, Any]],
+    generation: int,
+) -> None:
+    for row in rows:
+        uid = UUID(row["uuid"])
+        _cache_user_row(uid, row, generation)
+        found[str(uid)] = row
+
+
+def _get_user_rows_by_ids(user_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 uuid 의 user_profile row 를 str(uuid) -> row 로.
+    캐시에 없는 것만 in.(...) 쿼리로 읽고(_USER_BATCH_SIZE 씩), 없는 유저는 결과에서 빠진다.
+    """
+    found, missing = _split_cached_user_rows(user_ids)
+    generation = _profile_generation
+    for i in range(0, len(missing), _USER_BATCH_SIZE):
+        rows = _sb_get(SUPABASE_USERS_TABLE, _users_by_ids_params(missing[i:i + _USER_BATCH_SIZE]))
+        _store_user_rows(found, rows, generation)
+    return found
+
+
+async def _get_user_rows_by_ids_async(user_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """_get_user_rows_by_ids 의 async 판 (나눠진 쿼리는 동시에 보냄)."""
+    found, missing = _split_cached_user_rows(user_ids)
+    generation = _profile_generation
+    chunks = [missing[i:i + _USER_BATCH_SIZE] for i in range(0, len(missing), _USER_BATCH_SIZE)]
+    results = await asyncio.gather(
+        *(_sb_get_async(SUPABASE_USERS_TABLE, _users_by_ids_params(c)) for c in chunks)
     )
-    return rows[0] if rows else None
+    for rows in results:
+        _store_user_rows(found, rows, generation)
+    return found
 
 
-def _get_user_row_by_id(user_id: UUID) -> Dict[str, Any]:
+def _get_user_row_by_kakao(kakao_id: str) -> Optional[Dict[str, Any]]:
     """
-    uuid 로 user_profile 에서 한 명 조회
+    kakao_id 로 user_profile 에서 한 명 조회
     """
     rows = _sb_get(
         SUPABASE_USERS_TABLE,
@@ -145,28 +389,32 @@ def _get_user_row_by_id(user_id: UUID) -> Dict[str, Any]:
             "select": "uuid,kakao_id,nickname,birth_date,gender,height,weight,"
                       "muscle_mass,skill_level,favorite_sports,sportsmanship,"
                       "latitude,longitude",
-            "uuid": f"eq.{user_id}",
+            "kakao_id": f"eq.{kakao_id}",
             "limit": 1,
         },
     )
-    if not rows:
-        raise KeyError("user not found")
-    return rows[0]
+    return rows[0] if rows else None
 
 
-def _insert_user_row(kakao_id: str) -> Dict[str, Any]:
+def _upsert_user_row_by_kakao(kakao_id: str) -> Tuple[Dict[str, Any], bool]:
     """
-    카카오 로그인 최초 시, user_profile 에 기본 row 하나 생성
+    kakao_id 로 user_profile row 를 (없으면) 생성 + 조회. (row, 새로 만들었는지) 리턴.
+    이미 있으면 insert 가 무시되고 기존 row 를 다시 읽으므로 닉네임, 매너온도 등은 그대로.
+    user_profile.kakao_id 에 unique 제약이 있어야 함
+    (migrations/001_user_profile_kakao_id_unique.sql)
     """
-    return _sb_post(
+    row = _sb_insert_ignore(
         SUPABASE_USERS_TABLE,
         {
             "kakao_id": kakao_id,
-            # 필요하면 기본값 더 넣어도 됨
             "sportsmanship": 0.0,
             "favorite_sports": [],
         },
+        on_conflict="kakao_id",
     )
+    if row:
+        return row, True
+    return _get_user_row_by_kakao(kakao_id) or {}, False
 
 
 def _row_to_auth_user(
@@ -209,31 +457,35 @@ def _row_to_auth_user(
 # 외부에서 쓰는 서비스 함수들
 # ============================================================
 
+def _kakao_identity(access_token: str) -> Tuple[str, Optional[str]]:
+    """카카오 access token -> (kakao_id, 닉네임). 최근에 본 토큰이면 캐시에서."""
+    digest = hashlib.sha256(access_token.encode()).digest()
+    cached = kakao_token_cache.get(digest)
+    if cached is not None:
+        return cached
+
+    data = get_kakao_profile(access_token)
+    profile = data.get("kakao_account", {}).get("profile", {})
+    identity = (str(data["id"]), profile.get("nickname"))
+    kakao_token_cache.set(digest, identity)
+    return identity
+
+
 def login_with_kakao(access_token: str) -> tuple[AuthUser, bool]:
     """
-    1) 카카오에서 프로필 조회
-    2) kakao_id 기준으로 Supabase users 에서 유저 생성/조회
+    1) 카카오에서 프로필 조회 (같은 토큰이면 캐시)
+    2) kakao_id 기준으로 Supabase user_profile 에 없으면 insert, 있으면 조회
     3) AuthUser + is_new_user 리턴
     """
-    data = get_kakao_profile(access_token)
-
-    kakao_id = str(data["id"])
-    profile = data.get("kakao_account", {}).get("profile", {})
-
-    nickname = profile.get("nickname")
+    kakao_id, nickname = _kakao_identity(access_token)
 
-    # 1) users 테이블에서 kakao_id 로 검색
-    user_row = _get_user_row_by_kakao(kakao_id)
+    user_row, is_new = _upsert_user_row_by_kakao(kakao_id)
     if not user_row:
-        # 신규 가입 → users 에 row 만들기
-        user_row = _insert_user_row(kakao_id)
-        is_new = True
-    else:
-        is_new = False
+        raise RuntimeError("user_profile upsert 결과가 비어 있습니다.")
 
-    user_id = UUID(user_row["uuid"])
+    # 방금 넣거나 읽은 row 라서 바로 이어지는 인증 요청은 DB 안 가고 씀
+    _cache_user_row(UUID(user_row["uuid"]), user_row, _profile_generation)
 
-    
     auth_user = _row_to_auth_user(user_row, profile_row=None, kakao_nickname=nickname)
 
     return auth_user, is_new
@@ -255,6 +507,7 @@ def sign_up(user_id: UUID, req: SignUpRequestDto) -> AuthUser:
         {"uuid": f"eq.{user_id}"},
         body,
     )
+    invalidate_user_profile(user_id)
     return _row_to_auth_user(row, None)
 
 
@@ -277,6 +530,7 @@ def update_profile(user_id: UUID, req: ProfileUpdateRequestDto) -> AuthUser:
         {"uuid": f"eq.{user_id}"},
         body,
     )
+    invalidate_user_profile(user_id)
     return _row_to_auth_user(row, None)
 
 
@@ -296,3 +550,4 @@ def delete_user(user_id: UUID) -> None:
         SUPABASE_USERS_TABLE,
         {"uuid": f"eq.{user_id}"},
     )
+    invalidate_user_profile(user_id)
@@ -0,0 +1,274 @@
+# app/modules/bot/forecast.py
+"""
+기상청 예보(초단기예보 / 단기예보)로 "그 시간대에 실내만 추천해야 하나"를 답하는 모듈.
+
+현재 날씨(weather.get_observation)는 지금 이 시각 관측값이라,
+내일 저녁 7시 파티에는 예보를 봐야 한다.
+- 초단기예보(getUltraSrtFcst): 매시 30분 발표(XX:45 이후 제공), 앞으로 6시간, 1시간 단위
+- 단기예보(getVilageFcst): 02/05/08/11/14/17/20/23시 발표(+10분 후 제공), 약 3일, 1시간 단위
+격자 + 발표 시각마다 한 번만 받아서 캐시해 두고 같은 격자 사용자 전부가 같이 쓴다.
+기상청 장애 처리(회로 차단기, 마지막 예보 재사용)는 관측값과 같은 규칙을 따른다.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+from app.config import KMA_API_KEY, WEATHER_STALE_MAX_SEC
+from app.core.cache import TTLCache
+from app.core.singleflight import SingleFlight
+
+from .kma_grid import latlon_to_grid
+from .weather import (
+    TOO_COLD_C,
+    TOO_HOT_C,
+    KmaUnavailable,
+    _kma_items,
+    _now_kst,
+    get_cell_observation,
+    weather_breaker,
+)
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+ULTRA_URL = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtFcst"
+SHORT_URL = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
+
+ULTRA = "ultra"
+SHORT = "short"
+
+ULTRA_BASE_MINUTE = 30
+ULTRA_AVAILABLE_MINUTE = 45
+ULTRA_HORIZON_HOURS = 6
+SHORT_BASE_HOURS = (2, 5, 8, 11, 14, 17, 20, 23)
+SHORT_AVAILABLE_MINUTE = 10
+
+# 예보 강수형태: 1 비, 2 비/눈, 3 눈, 4 소나기 (초단기예보는 5~7 빗방울/눈날림도 있지만 약해서 제외)
+RAIN_OR_SNOW_PTY = (1, 2, 3, 4)
+
+# 종류별 (URL, 기온 카테고리, 요청 행 수). 단기예보는 3일치 x 10여 개 카테고리라 넉넉히
+_KIND_PARAMS = {
+    ULTRA: (ULTRA_URL, "T1H", 100),
+    SHORT: (SHORT_URL, "TMP", 1000),
+}
+
+
+def _base_datetime(kind: str, now: datetime) -> datetime:
+    """kind 예보 중 now 시점에 받을 수 있는 가장 최근 발표 시각."""
+    if kind == ULTRA:
+        base = now.replace(minute=ULTRA_BASE_MINUTE, second=0, microsecond=0)
+        if now.minute < ULTRA_AVAILABLE_MINUTE:
+            base -= timedelta(hours=1)
+        return base
+
+    day = now.replace(minute=0, second=0, microsecond=0)
+    for hour in reversed(SHORT_BASE_HOURS):
+        base = day.replace(hour=hour)
+        if base + timedelta(minutes=SHORT_AVAILABLE_MINUTE) <= now:
+            return base
+    # 02:10 전이면 전날 23시 발표
+    return (day - timedelta(days=1)).replace(hour=SHORT_BASE_HOURS[-1])
+
+
+def _seconds_until_next_base(kind: str, now: datetime) -> float:
+    """다음 발표가 받아질 때까지 남은 초 (캐시 TTL). 초단기는 1시간, 단기는 3시간 간격."""
+    base = _base_datetime(kind, now)
+    if kind == ULTRA:
+        next_at = base + timedelta(hours=1, minutes=ULTRA_AVAILABLE_MINUTE - ULTRA_BASE_MINUTE)
+    else:
+        next_at = base + timedelta(hours=3, minutes=SHORT_AVAILABLE_MINUTE)
+    return max(60.0, (next_at - now).total_seconds())
+
+
+def _to_kst_naive(dt: datetime) -> datetime:
+    """tz 가 붙은 시각은 KST 로 바꾸고 tz 를 뗀다 (이 모듈은 KST naive 로 계산)."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(KST).replace(tzinfo=None)
+    return dt
+
+
+# ------------------ 예보 캐시 ------------------ #
+@dataclass(frozen=True)
+class Forecast:
+    """한 격자의 한 발표분 예보. hours: 예보 시각(정시, KST) -> (기온, 강수형태)."""
+    kind: str
+    nx: int
+    ny: int
+    base_date: str
+    base_time: str
+    hours: Dict[datetime, Tuple[Optional[float], int]]
+    fetched_at: float = field(default_factory=time.time)
+    stale: bool = False
+
+
+# (kind, nx, ny, base_date, base_time) -> Forecast. 다음 발표가 받아지는 시각에 만료
+forecast_cache: TTLCache[Tuple[str, int, int, str, str], Forecast] = TTLCache(
+    maxsize=2048,
+    ttl_sec=3 * 60 * 60,
+    name="kma-fcst",
+)
+forecast_flight: SingleFlight[Optional[Forecast]] = SingleFlight(name="kma-fcst")
+_last_known: Dict[Tuple[str, int, int], Forecast] = {}
+
+
+def _stale_forecast(kind: str, nx: int, ny: int) -> Optional[Forecast]:
+    last = _last_known.get((kind, nx, ny))
+    if last is None or time.time() - last.fetched_at > WEATHER_STALE_MAX_SEC:
+        return None
+    return replace(last, stale=True)
+
+
+def _fetch_forecast(kind: str, nx: int, ny: int, base_date: str, base_time: str) -> Optional[Forecast]:
+    """예보 한 번 호출해서 시각별 기온 / 강수형태만 뽑음. item 이 없으면 None, 기상청 장애면 KmaUnavailable."""
+    url, temp_category, rows = _KIND_PARAMS[kind]
+    params = {
+        "serviceKey": KMA_API_KEY,
+        "numOfRows": rows,
+        "pageNo": 1,
+        "dataType": "JSON",
+        "base_date": base_date,
+        "base_time": base_time,
+        "nx": nx,
+        "ny": ny,
+    }
+
+    items = _kma_items(url, params, "forecast")
+    if not items:
+        return None
+
+    temps: Dict[datetime, float] = {}
+    ptys: Dict[datetime, int] = {}
+    for it in items:
+        cat = it.get("category")
+        if cat != temp_category and cat != "PTY":
+            continue
+        try:
+            at = datetime.strptime(f"{it['fcstDate']}{it['fcstTime']}", "%Y%m%d%H%M")
+            if cat == "PTY":
+                ptys[at] = int(float(it["fcstValue"]))
+            else:
+                temps[at] = float(it["fcstValue"])
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    hours = {at: (temps.get(at), ptys.get(at, 0)) for at in set(temps) | set(ptys)}
+    return Forecast(kind=kind, nx=nx, ny=ny, base_date=base_date, base_time=base_time, hours=hours)
+
+
+def get_cell_forecast(kind: str, nx: int, ny: int, now: Optional[datetime] = None) -> Optional[Forecast]:
+    """격자 (nx, ny) 의 최신 kind 예보 (캐시 -> 없으면 single-flight 로 한 번만 호출)."""
+    now = now or _now_kst()
+    base = _base_datetime(kind, now)
+    base_date, base_time = base.strftime("%Y%m%d"), base.strftime("%H%M")
+    key = (kind, nx, ny, base_date, base_time)
+
+    cached = forecast_cache.get(key)
+    if cached is not None:
+        return cached
+
+    def fetch() -> Optional[Forecast]:
+        try:
+            fetched = _fetch_forecast(kind, nx, ny, base_date, base_time)
+        except KmaUnavailable:
+            weather_breaker.record_failure()
+            return None
+        except Exception as e:
+            # 예상 못 한 오류도 실패로 세야 시험 호출(half-open)이 결과 없이 끝나 차단기가 멈추지 않는다
+            weather_breaker.record_failure()
+            logger.warning("[kma] forecast fetch failed: %r", e)
+            return None
+        # 발표 전이라 비어 있는 응답은 장애가 아니라 캐시 미스
+        weather_breaker.record_success()
+        if fetched is None:
+            return None
+        forecast_cache.set(key, fetched, ttl_sec=_seconds_until_next_base(kind, now))
+        _last_known[(kind, nx, ny)] = fetched
+        return fetched
+
+    # 관측값과 같은 차단기를 같이 쓴다 (같은 기상청 서버)
+    if not weather_breaker.allow():
+        if weather_breaker.try_probe():
+            threading.Thread(
+                target=forecast_flight.do, args=(key, fetch), name="kma-probe", daemon=True
+            ).start()
+        return _stale_forecast(kind, nx, ny)
+
+    fetched = forecast_flight.do(key, fetch)
+    if fetched is None:
+        return _stale_forecast(kind, nx, ny)
+    return fetched
+
+
+# ------------------ 시간대 판단 ------------------ #
+def _hours_between(start: datetime, end: datetime) -> List[datetime]:
+    """[start, end] 에 걸친 정시들 (start 가 속한 시각부터). end <= start 면 start 한 시간만."""
+    hour = start.replace(minute=0, second=0, microsecond=0)
+    hours = [hour]
+    hour += timedelta(hours=1)
+    while hour < end:
+        hours.append(hour)
+        hour += timedelta(hours=1)
+    return hours
+
+
+def _is_bad(temp_c: Optional[float], pty: int, rain_codes: Iterable[int]) -> bool:
+    if pty in rain_codes:
+        return True
+    return temp_c is not None and (temp_c <= TOO_COLD_C or temp_c >= TOO_HOT_C)
+
+
+def indoor_only_during(
+    lat: float,
+    lon: float,
+    start: datetime,
+    end: Optional[datetime] = None,
+    now: Optional[datetime] = None,
+) -> Optional[bool]:
+    """
+    (lat, lon) 에서 [start, end] 동안 비/눈이 오거나 너무 춥거나/더운 시각이 있으면 True.
+    - 지금 시각은 초단기실황, 6시간 안은 초단기예보, 그 뒤는 단기예보를 본다
+    - 필요한 예보 종류만 부르고, 모두 격자 + 발표 시각 단위 캐시를 거친다
+    예보가 그 시간대를 전혀 덮지 못하면(키 없음, 너무 먼 미래, 장애) None.
+    """
+    if not KMA_API_KEY:
+        return None
+
+    now = _to_kst_naive(now) if now else _now_kst()
+    start = _to_kst_naive(start)
+    end = _to_kst_naive(end) if end else start
+    if end < now:
+        return None  # 이미 지난 시간대
+    current_hour = now.replace(minute=0, second=0, microsecond=0)
+    wanted = _hours_between(max(start, current_hour), end)
+
+    nx, ny = latlon_to_grid(lat, lon)
+    known: Dict[datetime, bool] = {}
+
+    if wanted[0] == current_hour:
+        obs = get_cell_observation(nx, ny)
+        if obs is not None:
+            known[current_hour] = _is_bad(obs.temp_c, obs.pty, (1, 2, 3))
+
+    ultra_until = current_hour + timedelta(hours=ULTRA_HORIZON_HOURS)
+    for kind in (ULTRA, SHORT):
+        missing = [h for h in wanted if h not in known]
+        if kind == ULTRA:
+            missing = [h for h in missing if h <= ultra_until]
+        if not missing:
+            continue
+        forecast = get_cell_forecast(kind, nx, ny, now)
+        if forecast is None:
+            continue
+        for h in missing:
+            value = forecast.hours.get(h)
+            if value is not None:
+                known[h] = _is_bad(value[0], value[1], RAIN_OR_SNOW_PTY)
+
+    if not known:
+        return None
+    return any(known.values())
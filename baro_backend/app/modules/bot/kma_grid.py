@@ -0,0 +1,107 @@
+# app/modules/bot/kma_grid.py
+"""
+위경도 -> 기상청 동네예보 격자(nx, ny) 변환.
+
+기상청 공개 변환식(람베르트 정각원추도법, 5km 격자)을 그대로 옮긴 것.
+서비스 지역은 위경도를 TABLE_STEP 단위로 잘라 미리 계산해 둔 표에서 바로 꺼내고,
+표 밖이거나 한 칸 안에 격자 경계가 지나가는 경우만 식으로 직접 계산한다.
+"""
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# 기상청 격자 상수
+RE = 6371.00877  # 지구 반경 (km)
+GRID = 5.0       # 격자 간격 (km)
+SLAT1 = 30.0     # 표준 위도 1
+SLAT2 = 60.0     # 표준 위도 2
+OLON = 126.0     # 기준점 경도
+OLAT = 38.0      # 기준점 위도
+XO = 43          # 기준점 X 좌표 (격자)
+YO = 136         # 기준점 Y 좌표 (격자)
+
+_DEGRAD = math.pi / 180.0
+_re = RE / GRID
+_slat1 = SLAT1 * _DEGRAD
+_slat2 = SLAT2 * _DEGRAD
+_olon = OLON * _DEGRAD
+_olat = OLAT * _DEGRAD
+_sn = math.log(math.cos(_slat1) / math.cos(_slat2)) / math.log(
+    math.tan(math.pi * 0.25 + _slat2 * 0.5) / math.tan(math.pi * 0.25 + _slat1 * 0.5)
+)
+_sf = math.tan(math.pi * 0.25 + _slat1 * 0.5) ** _sn * math.cos(_slat1) / _sn
+_ro = _re * _sf / math.tan(math.pi * 0.25 + _olat * 0.5) ** _sn
+
+
+def _project(lat: np.ndarray, lon: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """변환식 본체 (배열용, lookup 표 만들 때 씀). 반올림 전 실수 (x, y) 반환."""
+    ra = _re * _sf / np.tan(np.pi * 0.25 + lat * _DEGRAD * 0.5) ** _sn
+    theta = lon * _DEGRAD - _olon
+    theta = np.where(theta > np.pi, theta - 2.0 * np.pi, theta)
+    theta = np.where(theta < -np.pi, theta + 2.0 * np.pi, theta)
+    theta = theta * _sn
+    return ra * np.sin(theta) + XO, _ro - ra * np.cos(theta) + YO
+
+
+def latlon_to_grid_exact(lat: float, lon: float) -> Tuple[int, int]:
+    """변환식으로 직접 계산 (기상청 예제와 같이 +0.5 후 내림)."""
+    ra = _re * _sf / math.tan(math.pi * 0.25 + lat * _DEGRAD * 0.5) ** _sn
+    theta = lon * _DEGRAD - _olon
+    if theta > math.pi:
+        theta -= 2.0 * math.pi
+    if theta < -math.pi:
+        theta += 2.0 * math.pi
+    theta *= _sn
+    x = ra * math.sin(theta) + XO
+    y = _ro - ra * math.cos(theta) + YO
+    return int(math.floor(x + 0.5)), int(math.floor(y + 0.5))
+
+
+# ------------------ 서비스 지역 lookup 표 ------------------ #
+# 서울 전역 + 수도권 일부 (남쪽 위도, 북쪽 위도, 서쪽 경도, 동쪽 경도)
+TABLE_LAT_RANGE = (37.0, 38.0)
+TABLE_LON_RANGE = (126.5, 127.5)
+TABLE_STEP = 0.0025  # 도 (약 250m). 격자(5km)보다 충분히 작아야 경계 칸이 적다
+
+_N_LAT = int(round((TABLE_LAT_RANGE[1] - TABLE_LAT_RANGE[0]) / TABLE_STEP))
+_N_LON = int(round((TABLE_LON_RANGE[1] - TABLE_LON_RANGE[0]) / TABLE_STEP))
+
+
+def _build_table() -> List[Optional[Tuple[int, int]]]:
+    """
+    TABLE_STEP 칸마다 (nx, ny) 를 미리 계산해서 [i * _N_LON + j] 로 꺼내는 평평한 리스트로.
+    칸의 네 꼭짓점이 모두 같은 격자면 그 값, 아니면 None (경계 칸 -> 직접 계산).
+    """
+    lats = TABLE_LAT_RANGE[0] + np.arange(_N_LAT + 1) * TABLE_STEP
+    lons = TABLE_LON_RANGE[0] + np.arange(_N_LON + 1) * TABLE_STEP
+    lat_grid, lon_grid = np.meshgrid(lats, lons, indexing="ij")
+    x, y = _project(lat_grid, lon_grid)
+    # nx, ny 를 한 정수로 묶어서 꼭짓점 비교를 한 번에
+    code = np.floor(x + 0.5).astype(np.int64) * 1000 + np.floor(y + 0.5).astype(np.int64)
+
+    corner = code[:-1, :-1]
+    same = (corner == code[1:, :-1]) & (corner == code[:-1, 1:]) & (corner == code[1:, 1:])
+    return [
+        (int(c) // 1000, int(c) % 1000) if ok else None
+        for c, ok in zip(corner.ravel().tolist(), same.ravel().tolist())
+    ]
+
+
+# 파이썬 리스트로 들고 있어야 요청마다 numpy 스칼라 변환 비용이 안 든다. 처음 쓸 때 만든다
+_TABLE: Optional[List[Optional[Tuple[int, int]]]] = None
+
+
+def latlon_to_grid(lat: float, lon: float) -> Tuple[int, int]:
+    """위경도 -> (nx, ny). 서비스 지역 안은 표에서 바로, 나머지는 변환식으로."""
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = _build_table()
+
+    fi = (lat - TABLE_LAT_RANGE[0]) / TABLE_STEP
+    fj = (lon - TABLE_LON_RANGE[0]) / TABLE_STEP
+    if 0 <= fi < _N_LAT and 0 <= fj < _N_LON:
+        hit = _TABLE[int(fi) * _N_LON + int(fj)]
+        if hit is not None:
+            return hit
+    return latlon_to_grid_exact(lat, lon)
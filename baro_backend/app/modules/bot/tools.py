@@ -1,9 +1,11 @@
 # app/tools.py
-from typing import Optional, List, Dict, Any
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
 from langchain_core.tools import tool
 from .weather import get_simple_weather
 
-from app.db import get_profiled_facilities, get_nearby_parties
+from app.db import get_profiled_facilities
+from app.modules.party.service import PartyService
 
 
 def _bmi_category(bmi: float) -> str:
@@ -15,6 +17,15 @@ def _bmi_category(bmi: float) -> str:
         return "과체중"
     return "비만"
 
+def _parse_window(start_at: Optional[str], end_at: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """LLM 이 넘긴 시간 문자열 -> (start, end). 형식이 틀리면 (None, None) 으로 지금 날씨 기준 추천."""
+    try:
+        start = datetime.fromisoformat(start_at) if start_at else None
+        end = datetime.fromisoformat(end_at) if end_at else None
+    except (TypeError, ValueError):
+        return None, None
+    return start, end
+
 def _activity_multiplier(level: str) -> float:
     base = {"낮음": 28, "중간": 33, "높음": 38}
     return base.get(level, base["중간"])
@@ -28,10 +39,14 @@ def profile_based_sports_facilities(
     gender: Optional[str] = None,
     preferred_intensity: Optional[str] = None,
     limit: int = 5,
+    start_at: Optional[str] = None,
+    end_at: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
     사용자 프로필(위치, 선호 종목, 나이, 성별, 강도)을 기반으로 운동 시설을 추천합니다.
+    start_at / end_at ('YYYY-MM-DDTHH:MM') 을 주면 지금 날씨 대신 그 시간대 예보로 실내 여부를 정합니다.
     """
+    start, end = _parse_window(start_at, end_at)
     return get_profiled_facilities(
         user_lat=user_lat,
         user_lon=user_lon,
@@ -40,6 +55,8 @@ def profile_based_sports_facilities(
         gender=gender,
         preferred_intensity=preferred_intensity,
         limit=limit,
+        start=start,
+        end=end,
     )
 
 @tool
@@ -131,13 +148,40 @@ def nearby_parties(
     user_lon: float,
     max_distance_km: float = 5.0,
     limit: int = 5,
+    within_hours: Optional[float] = None,
+    only_available: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     주변 운동 파티(모임)를 찾습니다.
+    within_hours 를 주면 그 시간 안에 시작하는 파티만, only_available 이면 빈자리 있는 파티만.
     """
-    return get_nearby_parties(
-        user_lat=user_lat,
-        user_lon=user_lon,
-        max_distance_km=max_distance_km,
+    # DB 를 다시 조회하지 않고 프로세스 안의 파티 위치 인덱스에서 바로 찾는다
+    parties = PartyService().find_nearby_parties(
+        lat=user_lat,
+        lng=user_lon,
+        radius_km=max_distance_km,
+        within_hours=within_hours,
+        only_available=only_available,
         limit=limit,
-    )
\ No newline at end of file
+    )
+    return [
+        {
+            "id": p.party_id,
+            "title": p.title,
+            "sports_nm": p.sport,
+            "place": p.place,
+            "lat": p.place_lat,
+            "lon": p.place_lng,
+            "date": p.date,
+            "start_time": p.start_time,
+            "end_time": p.end_time,
+            "max_members": p.capacity,
+            "current": p.current,
+            "free_slots": p.free_slots,
+            "notes": p.description,
+            "status": p.status,
+            "distance_km": p.distance_km,
+            "indoor_only": p.indoor_only,
+        }
+        for p in parties
+    ]
@@ -1,10 +1,31 @@
 # app/weather.py
-import requests
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, List
 import logging
 
-from app.config import KMA_API_KEY
+import requests
+
+from app.config import (
+    KMA_API_KEY,
+    WEATHER_PREFETCH_DELAY_SEC,
+    WEATHER_PREFETCH_JITTER_SEC,
+    WEATHER_PREFETCH_WORKERS,
+    WEATHER_PREFETCH_ACTIVE_SEC,
+    WEATHER_STALE_MAX_SEC,
+    WEATHER_BREAKER_FAILURES,
+    WEATHER_BREAKER_RESET_SEC,
+)
+from app.core.cache import TTLCache
+from app.core.circuit import CircuitBreaker
+from app.core.http import kma_http
+from app.core.singleflight import SingleFlight
+
+from .kma_grid import latlon_to_grid
 
 logger = logging.getLogger(__name__)
 
@@ -14,24 +35,27 @@ TOO_HOT_C = 30.0
 
 
 def _latlon_to_nxny(lat: float, lon: float) -> Tuple[int, int]:
-    """
-    기상청 격자 좌표(nx, ny)로 변환.
-    지금은 서비스 범위를 송파구로 가정하고 송파구 격자를 상수로 사용.
-    (실제 nx, ny 값은 송파구 기준으로 맞춰서 사용하면 됨)
-    """
-    NX_SONGPA = 62  # 송파구에 맞는 값으로 세팅한 상태라고 가정
-    NY_SONGPA = 126
-    return NX_SONGPA, NY_SONGPA
+    """기상청 격자 좌표(nx, ny)로 변환 (람베르트 정각원추도법, kma_grid 참고)."""
+    return latlon_to_grid(lat, lon)
+
+
+# 초단기실황: 매시 정시 관측값이 XX:40 이후에 올라옴
+NCST_URL = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst"
+NCST_AVAILABLE_MINUTE = 40
+
 
+def _now_kst() -> datetime:
+    return datetime.utcnow() + timedelta(hours=9)
 
-def _current_base_datetime() -> Tuple[str, str]:
+
+def _current_base_datetime(now: Optional[datetime] = None) -> Tuple[str, str]:
     """
     초단기실황(getUltraSrtNcst)용 base_date, base_time 계산.
     - 매시간 XX:40 이후에 직전 정시 데이터가 갱신되므로
       40분 전이면 한 시간 전 정시를, 그 이후면 현재 정시를 사용.
     """
-    now = datetime.utcnow() + timedelta(hours=9)  # KST
-    if now.minute < 40:
+    now = now or _now_kst()
+    if now.minute < NCST_AVAILABLE_MINUTE:
         base_dt = now - timedelta(hours=1)
     else:
         base_dt = now
@@ -40,23 +64,96 @@ def _current_base_datetime() -> Tuple[str, str]:
     return base_date, base_time
 
 
-def is_indoor_only(lat: float, lon: float) -> bool:
+def _seconds_until_next_base(now: Optional[datetime] = None) -> float:
+    """다음 base_time 자료가 올라오는 시각(다음 XX:40)까지 남은 초."""
+    now = now or _now_kst()
+    next_at = now.replace(minute=NCST_AVAILABLE_MINUTE, second=0, microsecond=0)
+    if next_at <= now:
+        next_at += timedelta(hours=1)
+    return (next_at - now).total_seconds()
+
+
+# ------------------ 관측값 캐시 ------------------ #
+@dataclass(frozen=True)
+class Observation:
+    """한 격자(nx, ny)의 한 시각(base_date, base_time) 초단기실황 관측값."""
+    nx: int
+    ny: int
+    base_date: str
+    base_time: str
+    temp_c: Optional[float]
+    pty: int  # 0: 없음, 1: 비, 2: 비/눈, 3: 눈
+    fetched_at: float = field(default_factory=time.time)
+    stale: bool = False  # 기상청 장애로 마지막으로 받은 관측값을 대신 쓰는 중
+
+
+# (nx, ny, base_date, base_time) -> Observation.
+# 다음 base_time 이 올라오는 XX:40 에 정확히 만료되게 항목마다 TTL 을 준다.
+observation_cache: TTLCache[Tuple[int, int, str, str], Observation] = TTLCache(
+    maxsize=1024,
+    ttl_sec=60 * 60,
+    name="kma-ncst",
+)
+
+
+# 같은 (nx, ny, base_date, base_time) 을 동시에 묻는 호출은 기상청 요청 하나를 같이 기다림
+observation_flight: SingleFlight[Optional[Observation]] = SingleFlight(name="kma-ncst")
+
+# 기상청이 계속 실패하면 잠시 호출을 끊고, 그동안은 격자별 마지막 관측값(stale)으로 답함
+weather_breaker = CircuitBreaker(
+    name="kma",
+    failure_threshold=WEATHER_BREAKER_FAILURES,
+    reset_sec=WEATHER_BREAKER_RESET_SEC,
+)
+_last_known: Dict[Tuple[int, int], Observation] = {}
+
+
+def _stale_observation(nx: int, ny: int) -> Optional[Observation]:
+    """WEATHER_STALE_MAX_SEC 안에 받은 마지막 관측값이 있으면 stale 표시해서 반환."""
+    last = _last_known.get((nx, ny))
+    if last is None or time.time() - last.fetched_at > WEATHER_STALE_MAX_SEC:
+        return None
+    return replace(last, stale=True)
+
+
+class KmaUnavailable(Exception):
+    """기상청 서버 쪽 장애 (연결 실패 / timeout / 5xx). 회로 차단기는 이것만 실패로 센다."""
+
+
+def _kma_items(url: str, params: Dict[str, Any], tag: str) -> List[Dict[str, Any]]:
     """
-    기상청 API(초단기실황)를 이용해
-    - 비/눈(PTY 1,2,3)이 오거나
-    - 기온(T1H)이 너무 춥거나/더우면
-    True를 반환 → 실내 운동만 추천.
+    기상청 API 한 번 호출해서 response.body.items.item 목록을 반환.
+    - 연결 실패 / timeout / 5xx 면 KmaUnavailable
+    - 4xx, JSON 이 아닌 응답, item 없음(발표 직후 아직 안 올라온 경우 등)은 빈 리스트
     """
-    if not KMA_API_KEY:
-        # 키 없으면 날씨 기반 필터 비활성
-        logger.warning("[weather] KMA_API_KEY not set, skipping weather check.")
-        return False
+    try:
+        resp = kma_http.get(url, params=params)
+    except requests.RequestException as e:
+        logger.warning(f"[{tag}] API error: {e}")
+        raise KmaUnavailable(str(e)) from e
+    if resp.status_code >= 500:
+        logger.warning(f"[{tag}] API error: HTTP {resp.status_code}")
+        raise KmaUnavailable(f"HTTP {resp.status_code}")
+    if not resp.ok:
+        logger.warning(f"[{tag}] API error: HTTP {resp.status_code}")
+        return []
 
-    nx, ny = _latlon_to_nxny(lat, lon)
-    base_date, base_time = _current_base_datetime()
+    try:
+        items = resp.json()["response"]["body"]["items"]["item"]
+    except (ValueError, KeyError, TypeError):
+        # 자료가 없으면 items 가 "" 로 오거나, 인증 오류 등은 XML 로 온다
+        items = None
+    if not items or not isinstance(items, list):
+        logger.warning(f"[{tag}] No items in KMA response.")
+        return []
+    return items
 
-    # 초단기실황 API 사용
-    url = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst"
+
+def _fetch_observation(nx: int, ny: int, base_date: str, base_time: str) -> Optional[Observation]:
+    """
+    기상청 초단기실황 한 번 호출해서 기온(T1H) / 강수형태(PTY)만 뽑음.
+    아직 발표 전 등으로 item 이 없으면 None, 기상청 장애면 KmaUnavailable.
+    """
     params = {
         "serviceKey": KMA_API_KEY,
         "numOfRows": 100,
@@ -68,25 +165,9 @@ def is_indoor_only(lat: float, lon: float) -> bool:
         "ny": ny,
     }
 
-    try:
-        resp = requests.get(url, params=params, timeout=5)
-        resp.raise_for_status()
-        data = resp.json()
-    except Exception as e:
-        logger.warning(f"[weather] API error: {e}")
-        # API 오류 나면 날씨 필터 없이 진행
-        return False
-
-    items = (
-        data.get("response", {})
-        .get("body", {})
-        .get("items", {})
-        .get("item", [])
-    )
-
+    items = _kma_items(NCST_URL, params, "weather")
     if not items:
-        logger.warning("[weather] No items in KMA response.")
-        return False
+        return None
 
     temp_c = None
     pty = 0  # 0: 없음, 1: 비, 2: 비/눈, 3: 눈
@@ -106,23 +187,238 @@ def is_indoor_only(lat: float, lon: float) -> bool:
             # 값 이상하면 무시
             continue
 
-    is_rain_or_snow = pty in (1, 2, 3)
+    return Observation(
+        nx=nx,
+        ny=ny,
+        base_date=base_date,
+        base_time=base_time,
+        temp_c=temp_c,
+        pty=pty,
+    )
+
+
+def get_observation(lat: float, lon: float) -> Optional[Observation]:
+    """
+    사용자 위치의 현재 초단기실황 관측값.
+    같은 격자 / 같은 base_time 이면 캐시된 값을 쓰고, 기상청은 격자당 한 시간에 한 번만 부른다.
+    키가 없거나 호출이 실패하면 None (실패는 캐시하지 않음).
+    """
+    if not KMA_API_KEY:
+        return None
+
+    nx, ny = _latlon_to_nxny(lat, lon)
+    # 최근에 요청이 있었던 격자는 다음 발표 직후 미리 받아 두도록 표시
+    weather_prefetcher.touch(nx, ny)
+    return get_cell_observation(nx, ny)
+
+
+def get_cell_observation(nx: int, ny: int) -> Optional[Observation]:
+    """격자 (nx, ny) 의 현재 base_time 관측값 (캐시 -> 없으면 single-flight 로 한 번만 호출)."""
+    now = _now_kst()
+    base_date, base_time = _current_base_datetime(now)
+    key = (nx, ny, base_date, base_time)
+
+    obs = observation_cache.get(key)
+    if obs is not None:
+        return obs
+
+    def fetch() -> Optional[Observation]:
+        try:
+            fetched = _fetch_observation(nx, ny, base_date, base_time)
+        except KmaUnavailable:
+            weather_breaker.record_failure()
+            return None
+        except Exception as e:
+            # 예상 못 한 오류도 실패로 세야 시험 호출(half-open)이 결과 없이 끝나 차단기가 멈추지 않는다
+            weather_breaker.record_failure()
+            logger.warning("[kma] observation fetch failed: %r", e)
+            return None
+        # 기상청은 응답했음. item 이 없는 건 아직 발표 전일 뿐이라 장애로 세지 않고 캐시 미스로 둔다
+        weather_breaker.record_success()
+        if fetched is None:
+            return None
+        observation_cache.set(key, fetched, ttl_sec=_seconds_until_next_base(now))
+        _last_known[(nx, ny)] = fetched
+        return fetched
+
+    # 차단 중이면 기상청을 기다리지 않고 바로 마지막 관측값으로.
+    # 재시도 시간이 됐으면 시험 호출은 백그라운드로 보내서 이 요청은 기다리지 않는다.
+    if not weather_breaker.allow():
+        if weather_breaker.try_probe():
+            threading.Thread(
+                target=observation_flight.do,
+                args=(key, fetch),
+                name="kma-probe",
+                daemon=True,
+            ).start()
+        return _stale_observation(nx, ny)
+
+    # XX:40 에 캐시가 한꺼번에 만료돼도 같은 격자/시각 요청은 기상청에 한 번만 보냄
+    obs = observation_flight.do(key, fetch)
+    if obs is None:
+        return _stale_observation(nx, ny)
+    return obs
+
+
+# ------------------ 활성 격자 미리 받기 ------------------ #
+class WeatherPrefetcher:
+    """
+    최근 active_sec 안에 요청이 있었던 격자를 기억해 두었다가,
+    매시 XX:40 발표 후 delay_sec + (0 ~ jitter_sec 랜덤) 뒤에 한꺼번에 미리 받아서
+    그 시간대 첫 사용자도 캐시를 바로 쓰게 한다.
+    - 동시에 부르는 수는 max_workers 로 제한
+    - 아직 발표가 안 올라와 실패한 격자는 retry_sec 뒤 retries 번까지 다시 시도
+    - status() 로 격자별 마지막 요청/갱신 시각과 결과를 볼 수 있음
+    """
+
+    def __init__(
+        self,
+        delay_sec: float,
+        jitter_sec: float,
+        max_workers: int,
+        active_sec: float,
+        retries: int = 2,
+        retry_sec: float = 60.0,
+    ) -> None:
+        self.delay_sec = delay_sec
+        self.jitter_sec = jitter_sec
+        self.max_workers = max_workers
+        self.active_sec = active_sec
+        self.retries = retries
+        self.retry_sec = retry_sec
+        self._cells: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.next_run_at: Optional[float] = None
+
+    def touch(self, nx: int, ny: int) -> None:
+        now = time.time()
+        with self._lock:
+            cell = self._cells.get((nx, ny))
+            if cell is None:
+                self._cells[(nx, ny)] = {"last_requested_at": now, "last_refresh_at": None,
+                                         "base": None, "ok": None}
+            else:
+                cell["last_requested_at"] = now
+
+    def active_cells(self) -> List[Tuple[int, int]]:
+        """active_sec 안에 요청이 있었던 격자. 오래된 격자는 여기서 정리."""
+        cutoff = time.time() - self.active_sec
+        with self._lock:
+            for key in [k for k, c in self._cells.items() if c["last_requested_at"] < cutoff]:
+                del self._cells[key]
+            return list(self._cells)
+
+    def refresh(self, cells: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """cells 의 현재 base_time 관측값을 받아 캐시에 채움. 실패한 격자 목록 반환."""
+        if not cells:
+            return []
+        base = "".join(_current_base_datetime())
+        failed: List[Tuple[int, int]] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="weather-prefetch") as pool:
+            results = list(pool.map(lambda c: (c, self._refresh_one(*c)), cells))
+        with self._lock:
+            for cell, obs in results:
+                state = self._cells.get(cell)
+                if state is not None:
+                    state["last_refresh_at"] = time.time()
+                    state["base"] = base
+                    state["ok"] = obs is not None and not obs.stale
+                if obs is None or obs.stale:
+                    failed.append(cell)
+        logger.info(f"[weather-prefetch] base={base} cells={len(cells)} failed={len(failed)}")
+        return failed
+
+    @staticmethod
+    def _refresh_one(nx: int, ny: int) -> Optional[Observation]:
+        try:
+            return get_cell_observation(nx, ny)
+        except Exception as e:
+            logger.warning(f"[weather-prefetch] ({nx}, {ny}) failed: {e}")
+            return None
+
+    def start(self) -> None:
+        if not KMA_API_KEY or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="weather-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            # 다음 발표(XX:40) 후 delay + jitter 만큼 기다렸다가
+            wait = _seconds_until_next_base() + self.delay_sec + random.uniform(0, self.jitter_sec)
+            self.next_run_at = time.time() + wait
+            if self._stopped.wait(timeout=wait):
+                return
+
+            failed = self.refresh(self.active_cells())
+            for _ in range(self.retries):
+                if not failed or self._stopped.wait(timeout=self.retry_sec):
+                    break
+                failed = self.refresh(failed)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            cells = [
+                {"nx": nx, "ny": ny, **state}
+                for (nx, ny), state in sorted(self._cells.items())
+            ]
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "next_run_at": self.next_run_at,
+            "active_sec": self.active_sec,
+            "cells": cells,
+        }
+
+
+weather_prefetcher = WeatherPrefetcher(
+    delay_sec=WEATHER_PREFETCH_DELAY_SEC,
+    jitter_sec=WEATHER_PREFETCH_JITTER_SEC,
+    max_workers=WEATHER_PREFETCH_WORKERS,
+    active_sec=WEATHER_PREFETCH_ACTIVE_SEC,
+)
+
+
+def is_indoor_only(lat: float, lon: float) -> bool:
+    """
+    기상청 API(초단기실황)를 이용해
+    - 비/눈(PTY 1,2,3)이 오거나
+    - 기온(T1H)이 너무 춥거나/더우면
+    True를 반환 → 실내 운동만 추천.
+    """
+    if not KMA_API_KEY:
+        # 키 없으면 날씨 기반 필터 비활성
+        logger.warning("[weather] KMA_API_KEY not set, skipping weather check.")
+        return False
+
+    obs = get_observation(lat, lon)
+    if obs is None:
+        # API 오류 나면 날씨 필터 없이 진행
+        return False
+
+    is_rain_or_snow = obs.pty in (1, 2, 3)
 
     is_extreme_temp = False
-    if temp_c is not None:
-        is_extreme_temp = (temp_c <= TOO_COLD_C) or (temp_c >= TOO_HOT_C)
+    if obs.temp_c is not None:
+        is_extreme_temp = (obs.temp_c <= TOO_COLD_C) or (obs.temp_c >= TOO_HOT_C)
 
     indoor_only = is_rain_or_snow or is_extreme_temp
 
-    print(
-        f"[weather-debug] base={base_date}{base_time}, temp={temp_c}, pty={pty}, "
-        f"is_rain_or_snow={is_rain_or_snow}, "
-        f"is_extreme_temp={is_extreme_temp}, "
-        f"indoor_only={indoor_only}",
-        flush=True,
+    logger.debug(
+        "[weather] base=%s%s, stale=%s, temp=%s, pty=%s, is_rain_or_snow=%s, is_extreme_temp=%s, indoor_only=%s",
+        obs.base_date, obs.base_time, obs.stale, obs.temp_c, obs.pty,
+        is_rain_or_snow, is_extreme_temp, indoor_only,
     )
     logger.info(
-        f"[weather] base={base_date}{base_time}, temp={temp_c}, pty={pty}, indoor_only={indoor_only}"
+        f"[weather] base={obs.base_date}{obs.base_time}, temp={obs.temp_c}, pty={obs.pty}, indoor_only={indoor_only}"
     )
 
     return indoor_only
@@ -134,86 +430,32 @@ def get_simple_weather(lat: float, lon: float) -> Optional[Dict[str, Any]]:
     - temp_c: 현재 기온 (°C)
     - condition: '맑음' / '비' / '눈' / '비 또는 눈' / '알 수 없음'
     """
-    if not KMA_API_KEY:
-        return None
-
-    # is_indoor_only에서 쓰던 것과 같은 방식으로 호출
-    nx, ny = _latlon_to_nxny(lat, lon)
-
-    # 현재 시간 기준 base_date/base_time 계산 (초단기실황 규칙)
-    now = datetime.utcnow() + timedelta(hours=9)  # KST
-    if now.minute < 40:
-        base_dt = now - timedelta(hours=1)
-    else:
-        base_dt = now
-    base_date = base_dt.strftime("%Y%m%d")
-    base_time = base_dt.strftime("%H00")
-
-    url = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst"
-    params = {
-        "serviceKey": KMA_API_KEY,
-        "numOfRows": 100,
-        "pageNo": 1,
-        "dataType": "JSON",
-        "base_date": base_date,
-        "base_time": base_time,
-        "nx": nx,
-        "ny": ny,
-    }
-
-    try:
-        resp = requests.get(url, params=params, timeout=5)
-        resp.raise_for_status()
-        data = resp.json()
-    except Exception as e:
-        logger.warning(f"[weather-simple] API error: {e}")
+    # is_indoor_only 와 같은 관측값(캐시)을 씀
+    obs = get_observation(lat, lon)
+    if obs is None:
         return None
 
-    items = (
-        data.get("response", {})
-        .get("body", {})
-        .get("items", {})
-        .get("item", [])
-    )
-    if not items:
-        return None
-
-    temp_c = None
-    pty = 0  # 0: 없음, 1: 비, 2: 비/눈, 3: 눈
-
-    for it in items:
-        cat = it.get("category")
-        val = it.get("obsrValue")
-        if val is None:
-            continue
-        try:
-            if cat == "T1H":
-                temp_c = float(val)
-            elif cat == "PTY":
-                pty = int(float(val))
-        except (TypeError, ValueError):
-            continue
-
     # 강수형태 → 하늘 상태 텍스트
-    if pty == 0:
+    if obs.pty == 0:
         condition = "맑음"
-    elif pty == 1:
+    elif obs.pty == 1:
         condition = "비"
-    elif pty == 2:
+    elif obs.pty == 2:
         condition = "비 또는 눈"
-    elif pty == 3:
+    elif obs.pty == 3:
         condition = "눈"
     else:
         condition = "알 수 없음"
 
-    print(
-        f"[weather-simple] base={base_date}{base_time}, temp={temp_c}, pty={pty}, condition={condition}",
-        flush=True,
+    logger.debug(
+        "[weather-simple] base=%s%s, temp=%s, pty=%s, condition=%s",
+        obs.base_date, obs.base_time, obs.temp_c, obs.pty, condition,
     )
 
     return {
-        "temp_c": temp_c,
+        "temp_c": obs.temp_c,
         "condition": condition,
-        "base_date": base_date,
-        "base_time": base_time,
-    }
\ No newline at end of file
+        "base_date": obs.base_date,
+        "base_time": obs.base_time,
+        "stale": obs.stale,
+    }
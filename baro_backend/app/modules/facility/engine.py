@@ -0,0 +1,405 @@
+# app/modules/facility/engine.py
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.geo import EARTH_RADIUS_KM, KM_PER_DEG_LAT
+
+from .sport_index import SportMatcher
+
+# 거리 점수가 0이 되는 거리 (km). 이보다 먼 시설은 거리 점수 0 으로 채점한다.
+D_MAX = 5.0
+
+# 가중치 (1~6순위)
+W_DIST = 0.2
+W_PREF = 0.2
+W_AGE = 0.2
+W_GENDER = 0.2
+W_INTENSITY = 0.05
+W_AGE_SPORTS = 0.05
+
+# 점수는 소수 3자리로 반올림해서 비교하므로, 미리 제외할 때는 그만큼 여유를 둔다
+_PRUNE_MARGIN = 1e-3
+
+# 사전에 없는 종목명으로 부분문자열 검색한 결과를 스냅샷마다 몇 개까지 기억할지
+_TERM_MASK_CACHE_SIZE = 256
+
+
+def _norm(text: str) -> str:
+    return (text or "").replace(" ", "").lower()
+
+
+@dataclass
+class ScoredFacilities:
+    """
+    채점 결과 중 상위 limit 개만 점수 순으로 담은 배열 묶음.
+    pos 는 FacilityColumns 안에서의 위치, row 는 원본 facilities 리스트 인덱스.
+    """
+    pos: np.ndarray
+    row: np.ndarray
+    distance_km: np.ndarray
+    dist_score: np.ndarray
+    pref_score: np.ndarray
+    age_sports_score: np.ndarray
+    intensity_score: np.ndarray
+    total_score: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.row)
+
+    def top(self, n: int) -> "ScoredFacilities":
+        """이미 점수 순이니 앞에서 n 개만 자른 결과."""
+        return ScoredFacilities(
+            pos=self.pos[:n],
+            row=self.row[:n],
+            distance_km=self.distance_km[:n],
+            dist_score=self.dist_score[:n],
+            pref_score=self.pref_score[:n],
+            age_sports_score=self.age_sports_score[:n],
+            intensity_score=self.intensity_score[:n],
+            total_score=self.total_score[:n],
+        )
+
+
+class FacilityColumns:
+    """
+    시설 스냅샷을 열(column) 배열로 펼쳐 둔 채점 엔진.
+    - 위도 오름차순으로 정렬해 두어서, 반경 검색 시 위도 구간은 이진탐색으로 잘라낸다
+      (구간은 slice 라 복사 없이 그대로 거리 계산에 쓴다)
+    - 종목은 exercise_methods 종목명 사전 기준 비트마스크(sport_bits)로,
+      운동 강도는 정수 코드(intensity_code, 0 = 모름)로 미리 계산해서
+      요청 시 종목/강도 매칭은 비트 AND / 정수 비교로 끝난다
+    - 한 번의 벡터 연산으로 거리와 6개 가중 점수를 모두 계산하고
+      argpartition 으로 상위 limit 개만 골라낸다
+    """
+
+    def __init__(
+        self,
+        facilities: List[Dict[str, Any]],
+        intensity_map: Dict[str, str],
+        extra_sports: Iterable[str] = (),
+    ) -> None:
+        rows: List[int] = []
+        lats: List[float] = []
+        lons: List[float] = []
+        for i, row in enumerate(facilities):
+            try:
+                lat = float(row["faci_lat"])
+                lon = float(row["faci_lot"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            rows.append(i)
+            lats.append(lat)
+            lons.append(lon)
+
+        lat_arr = np.asarray(lats, dtype=np.float64)
+        order = np.argsort(lat_arr, kind="stable")
+
+        self.row = np.asarray(rows, dtype=np.int64)[order]
+        self.lat = lat_arr[order]
+        self.lon = np.asarray(lons, dtype=np.float64)[order]
+        # haversine 의 삼각함수를 요청마다 계산하지 않도록 반각 sin/cos 를 미리 구해 둠
+        lat_rad = np.radians(self.lat)
+        lon_rad = np.radians(self.lon)
+        self.cos_lat = np.cos(lat_rad)
+        self.sin_half_lat = np.sin(lat_rad / 2)
+        self.cos_half_lat = np.cos(lat_rad / 2)
+        self.sin_half_lon = np.sin(lon_rad / 2)
+        self.cos_half_lon = np.cos(lon_rad / 2)
+
+        ordered = [facilities[i] for i in self.row]
+        self.indoor = np.array([r.get("inout_gbn_nm") == "실내" for r in ordered], dtype=bool)
+        self.ftype_norm = np.array([_norm(r.get("ftype_nm") or "") for r in ordered], dtype=str)
+
+        # 종목 사전(exercise_methods 종목명 + extra_sports)으로 Aho–Corasick 매처를 만들고,
+        # 시설마다 ftype_nm 을 한 번만 훑어서 종목 ID 집합(비트마스크)과 강도를 확정한다.
+        # 강도는 exercise_methods 순서상 가장 먼저 나오는 매칭 종목의 강도를 그 시설의 강도로 본다.
+        self.matcher = SportMatcher([*intensity_map, *extra_sports])
+        self.sport_ids: Dict[str, int] = self.matcher.ids
+        self.intensity_levels: List[str] = sorted(set(intensity_map.values()))
+        level_code = {level: i + 1 for i, level in enumerate(self.intensity_levels)}
+        sport_level = [
+            level_code[intensity_map[name]] if name in intensity_map else 0
+            for name in self.matcher.names
+        ]
+
+        n_words = max(1, (len(self.matcher) + 63) // 64)
+        bits_by_text: Dict[str, Tuple[List[int], int]] = {}
+        words: List[List[int]] = [[] for _ in range(n_words)]
+        codes: List[int] = []
+        for text in self.ftype_norm:
+            # 같은 ftype_nm 이 많아서 문자열별로 한 번만 매칭
+            hit = bits_by_text.get(text)
+            if hit is None:
+                ids = self.matcher.find_ids(text)
+                mask = 0
+                for sid in ids:
+                    mask |= 1 << sid
+                hit = (
+                    [(mask >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for w in range(n_words)],
+                    next((sport_level[sid] for sid in ids if sport_level[sid]), 0),
+                )
+                bits_by_text[text] = hit
+            for w in range(n_words):
+                words[w].append(hit[0][w])
+            codes.append(hit[1])
+
+        self.sport_bits = np.zeros((len(self.row), n_words), dtype=np.uint64)
+        for w in range(n_words):
+            self.sport_bits[:, w] = np.asarray(words[w], dtype=np.uint64)
+        self.intensity_code = np.asarray(codes, dtype=np.int8)
+
+        self._term_masks: Dict[str, np.ndarray] = {}
+
+    # 로컬 시설 저장소(store.py)에 그대로 떠 두는 열 배열들
+    ARRAY_FIELDS = (
+        "row",
+        "lat",
+        "lon",
+        "cos_lat",
+        "sin_half_lat",
+        "cos_half_lat",
+        "sin_half_lon",
+        "cos_half_lon",
+        "indoor",
+        "ftype_norm",
+        "sport_bits",
+        "intensity_code",
+    )
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrays: Dict[str, np.ndarray],
+        sport_names: List[str],
+        intensity_levels: List[str],
+    ) -> "FacilityColumns":
+        """
+        to_arrays() 로 떠 둔 배열(메모리 맵이어도 됨)로 다시 만든다.
+        ftype_nm 매칭을 다시 하지 않으니 sport_names 는 저장할 때의 종목 ID 순서 그대로여야 한다.
+        """
+        self = cls.__new__(cls)
+        for name in cls.ARRAY_FIELDS:
+            setattr(self, name, arrays[name])
+        self.matcher = SportMatcher(sport_names)
+        self.sport_ids = self.matcher.ids
+        self.intensity_levels = list(intensity_levels)
+        self._term_masks = {}
+        return self
+
+    def __len__(self) -> int:
+        return len(self.row)
+
+    # ------------------ 종목 매칭 ------------------ #
+    def sports_at(self, pos: int) -> List[str]:
+        """pos 위치 시설이 매칭된 (정규화된) 종목명 목록."""
+        return [
+            name
+            for sid, name in enumerate(self.matcher.names)
+            if int(self.sport_bits[pos, sid // 64]) >> (sid % 64) & 1
+        ]
+
+    def term_mask(self, terms: Iterable[str], idx: np.ndarray) -> np.ndarray:
+        """idx 위치의 시설들 중 ftype_nm 에 terms 가 하나라도 (공백 제거 후) 포함되면 True."""
+        query = np.zeros(self.sport_bits.shape[1], dtype=np.uint64)
+        mask = np.zeros(len(idx), dtype=bool)
+        for term in terms:
+            term = _norm(term)
+            sid = self.sport_ids.get(term)
+            if sid is not None:
+                query[sid // 64] |= np.uint64(1 << (sid % 64))
+                continue
+            # 사전에 없는 종목명은 부분문자열 검색 결과를 스냅샷 단위로 기억해 둠
+            hit = self._term_masks.get(term)
+            if hit is None:
+                hit = np.char.find(self.ftype_norm, term) >= 0
+                if len(self._term_masks) >= _TERM_MASK_CACHE_SIZE:
+                    self._term_masks.clear()
+                self._term_masks[term] = hit
+            mask |= hit[idx]
+        for word in np.flatnonzero(query):
+            mask |= (self.sport_bits[idx, word] & query[word]) != 0
+        return mask
+
+    def intensity_code_of(self, level: Optional[str]) -> int:
+        if not level or level not in self.intensity_levels:
+            return -1
+        return self.intensity_levels.index(level) + 1
+
+    # ------------------ 거리 ------------------ #
+    def _distance_km(self, lat: float, lon: float, idx) -> np.ndarray:
+        """haversine 거리. sin((x-y)/2) 를 미리 구한 반각 값의 곱으로 전개해서 계산."""
+        phi1 = np.radians(lat)
+        lambda1 = np.radians(lon)
+        sin_dphi = self.sin_half_lat[idx] * np.cos(phi1 / 2) - self.cos_half_lat[idx] * np.sin(phi1 / 2)
+        sin_dlambda = (
+            self.sin_half_lon[idx] * np.cos(lambda1 / 2)
+            - self.cos_half_lon[idx] * np.sin(lambda1 / 2)
+        )
+        a = sin_dphi ** 2 + np.cos(phi1) * self.cos_lat[idx] * sin_dlambda ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    def lat_band(self, lat: float, radius_km: float) -> slice:
+        """위도가 lat ± radius_km 안에 드는 구간. 위도순 정렬이라 이진탐색 두 번이면 된다."""
+        dlat = radius_km / KM_PER_DEG_LAT
+        lo = int(np.searchsorted(self.lat, lat - dlat, side="left"))
+        hi = int(np.searchsorted(self.lat, lat + dlat, side="right"))
+        return slice(lo, hi)
+
+    # ------------------ 채점 ------------------ #
+    def score(
+        self,
+        user_lat: float,
+        user_lon: float,
+        preferred_sports: Iterable[str] = (),
+        age_gender_pref_sports: Iterable[str] = (),
+        preferred_intensity: Optional[str] = None,
+        indoor_only: bool = False,
+        limit: int = 5,
+    ) -> ScoredFacilities:
+        """
+        시설 전체를 채점해서 상위 limit 개 반환 (D_MAX 밖 시설도 거리 점수만 0 이고 후보에 남는다).
+        - 종목/강도 점수를 먼저 매기고, 거리 점수를 최대로 받아도 상위 limit 에 못 드는 시설은 제외
+        - 거리는 D_MAX 안에 들 수 있는 위도 구간만 계산 (구간 밖은 거리 점수 0, 뽑힌 것만 거리를 채움)
+        """
+        limit = max(limit, 0)
+        idx = np.flatnonzero(self.indoor) if indoor_only else np.arange(len(self.row))
+        pref_score, age_sports_score, intensity_score = self._match_scores(
+            idx, preferred_sports, age_gender_pref_sports, preferred_intensity
+        )
+        band = self.lat_band(user_lat, D_MAX)
+        in_band = (idx >= band.start) & (idx < band.stop)
+
+        if 0 < limit < len(idx):
+            # 거리 점수 0 으로 본 점수(하한)의 limit 번째 값보다 거리 점수를 다 받아도(상한) 낮으면 탈락
+            base = (
+                W_PREF * pref_score
+                + (W_AGE + W_GENDER + W_AGE_SPORTS) * age_sports_score
+                + W_INTENSITY * intensity_score
+            )
+            kth = -np.partition(-base, limit - 1)[limit - 1]
+            keep = base + W_DIST * in_band >= kth - _PRUNE_MARGIN
+            if not keep.all():
+                idx, in_band = idx[keep], in_band[keep]
+                pref_score = pref_score[keep]
+                age_sports_score = age_sports_score[keep]
+                intensity_score = intensity_score[keep]
+
+        # 위도 구간 밖은 거리가 D_MAX 를 넘는 게 확실하니 계산을 미룸 (NaN = 아직 모름)
+        distance = np.full(len(idx), np.nan)
+        distance[in_band] = self._distance_km(user_lat, user_lon, idx[in_band])
+
+        scored = self._combine(idx, distance, pref_score, age_sports_score, intensity_score, limit)
+        unknown = np.isnan(scored.distance_km)
+        if unknown.any():
+            scored.distance_km[unknown] = self._distance_km(user_lat, user_lon, scored.pos[unknown])
+        return scored
+
+    def rescore(
+        self,
+        positions: np.ndarray,
+        user_lat: float,
+        user_lon: float,
+        preferred_sports: Iterable[str] = (),
+        age_gender_pref_sports: Iterable[str] = (),
+        preferred_intensity: Optional[str] = None,
+        limit: int = 5,
+    ) -> ScoredFacilities:
+        """
+        이미 골라 둔 후보(positions)만 이 사용자 위치 기준으로 다시 채점.
+        추천 결과 캐시 히트 시 거리/거리점수를 사용자별로 정확히 다시 계산하는 용도.
+        """
+        distance = self._distance_km(user_lat, user_lon, positions)
+        pref_score, age_sports_score, intensity_score = self._match_scores(
+            positions, preferred_sports, age_gender_pref_sports, preferred_intensity
+        )
+        return self._combine(
+            positions, distance, pref_score, age_sports_score, intensity_score, max(limit, 0)
+        )
+
+    def _match_scores(
+        self,
+        idx: np.ndarray,
+        preferred_sports: Iterable[str],
+        age_gender_pref_sports: Iterable[str],
+        preferred_intensity: Optional[str],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """거리와 상관없는 (선호 종목, 연령/성별 선호, 강도) 0/1 점수 float 배열."""
+        pref_terms = list(preferred_sports)
+        pref_score = np.zeros(len(idx))
+        if pref_terms:
+            pref_score = self.term_mask(pref_terms, idx).astype(np.float64)
+
+        # 나이/성별/연령별 선호는 같은 sports_pref 세트를 기반으로 가중치만 다르게 준다
+        age_terms = list(age_gender_pref_sports)
+        age_sports_score = np.zeros(len(idx))
+        if age_terms:
+            age_sports_score = self.term_mask(age_terms, idx).astype(np.float64)
+
+        intensity_score = np.zeros(len(idx))
+        code = self.intensity_code_of(preferred_intensity)
+        if code > 0:
+            intensity_score = (self.intensity_code[idx] == code).astype(np.float64)
+        return pref_score, age_sports_score, intensity_score
+
+    def _combine(
+        self,
+        idx: np.ndarray,
+        distance: np.ndarray,
+        pref_score: np.ndarray,
+        age_sports_score: np.ndarray,
+        intensity_score: np.ndarray,
+        limit: int,
+    ) -> ScoredFacilities:
+        # 거리가 NaN(계산 안 함)이면 거리 점수 0
+        dist_score = np.nan_to_num(np.maximum(0.0, (D_MAX - distance) / D_MAX), nan=0.0)
+
+        # 더하는 순서까지 예전 시설별 채점과 같게 둬야 소수 3자리 반올림 결과가 같다
+        total = (
+            W_DIST * dist_score
+            + W_PREF * pref_score
+            + W_AGE * age_sports_score
+            + W_GENDER * age_sports_score
+            + W_INTENSITY * intensity_score
+            + W_AGE_SPORTS * age_sports_score
+        )
+
+        return self._select(
+            idx, distance, dist_score, pref_score, age_sports_score, intensity_score, total, limit
+        )
+
+    def _select(
+        self,
+        idx: np.ndarray,
+        distance: np.ndarray,
+        dist_score: np.ndarray,
+        pref_score: np.ndarray,
+        age_sports_score: np.ndarray,
+        intensity_score: np.ndarray,
+        total: np.ndarray,
+        limit: int,
+    ) -> ScoredFacilities:
+        # 3) 상위 limit 개: 전체 정렬 대신 argpartition 으로 경계 점수만 구한 뒤
+        #    그 이상인 것들만 (점수 내림차순, 원본 시설 순서) 정렬 = 시설 리스트를 점수로 안정 정렬한 것과 같음
+        rounded = np.round(total, 3)
+        if 0 < limit < len(idx):
+            kth = -np.partition(-rounded, limit - 1)[limit - 1]
+            top = np.flatnonzero(rounded >= kth)
+        else:
+            top = np.arange(len(idx))
+        top = top[np.lexsort((self.row[idx[top]], -rounded[top]))][:limit]
+
+        return ScoredFacilities(
+            pos=idx[top],
+            row=self.row[idx[top]],
+            distance_km=distance[top],
+            dist_score=dist_score[top],
+            pref_score=pref_score[top],
+            age_sports_score=age_sports_score[top],
+            intensity_score=intensity_score[top],
+            total_score=total[top],
+        )
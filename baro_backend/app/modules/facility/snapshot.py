@@ -0,0 +1,132 @@
+# app/modules/facility/snapshot.py
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+from .engine import FacilityColumns
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class FacilitySnapshot:
+    """
+    시설 추천에 쓰는 참조 테이블 묶음 (한 번 만들어지면 바꾸지 않는다).
+    - facilities: songpa_sports_data row 목록 (로컬 저장소에서 열었으면 같은 모양의 읽기 전용 뷰)
+    - intensity_map: exercise_methods 의 sports_nm(정규화) -> intensity
+    - sports_pref: (나이대, 성별) -> 선호 종목명(정규화) 튜플. 읽기 전용 매핑
+    - columns: 위경도가 정상인 시설들을 위도순으로 정렬한 열 배열 (공간 인덱스 겸 채점 엔진)
+    """
+    facilities: Sequence[Mapping[str, Any]]
+    intensity_map: Dict[str, str]
+    sports_pref: Mapping[Tuple[str, str], Tuple[str, ...]]
+    columns: FacilityColumns
+    loaded_at: float = field(default_factory=time.time)
+
+
+def build_facility_snapshot(
+    facilities: List[Dict[str, Any]],
+    intensity_map: Dict[str, str],
+    sports_pref: Mapping[Tuple[str, str], Tuple[str, ...]],
+) -> FacilitySnapshot:
+    """원본 row 들로부터 추천에 필요한 파생 구조(공간 인덱스, 열 배열)까지 한 번에 만든다."""
+    # 연령/성별 선호 종목도 종목 사전에 넣어서 요청 시 부분문자열 검색 없이 비트로 매칭되게 함
+    pref_vocabulary = sorted({sp for sports in sports_pref.values() for sp in sports})
+    return FacilitySnapshot(
+        facilities=facilities,
+        intensity_map=intensity_map,
+        sports_pref=sports_pref,
+        columns=FacilityColumns(facilities, intensity_map, extra_sports=pref_vocabulary),
+    )
+
+
+class SnapshotStore(Generic[T]):
+    """
+    거의 바뀌지 않는 참조 데이터를 프로세스 메모리에 올려두고 재사용하는 저장소.
+    - 최초 get() (또는 start()) 시 loader 로 한 번 로드
+    - start() 하면 ttl_sec 마다 백그라운드 스레드가 새로 로드해서 통째로 교체
+    - 새로 로드하다 실패하면 직전 스냅샷을 그대로 계속 사용
+    - invalidate() 로 다음 주기를 기다리지 않고 바로 다시 로드
+    """
+
+    def __init__(self, name: str, loader: Callable[[], T], ttl_sec: float) -> None:
+        self.name = name
+        self._loader = loader
+        self._ttl_sec = ttl_sec
+        self._snapshot: Optional[T] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------ 조회 ------------------ #
+    def get(self) -> T:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        # 아직 한 번도 로드되지 않았으면 여기서 동기 로드 (동시 요청은 lock 에서 대기)
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = self._loader()
+                logger.info("[snapshot:%s] loaded", self.name)
+            return self._snapshot
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    # ------------------ 갱신 ------------------ #
+    def refresh(self) -> T:
+        """loader 로 새 스냅샷을 만들어 교체. 실패하면 예외를 그대로 올린다."""
+        with self._lock:
+            snapshot = self._loader()
+            self._snapshot = snapshot
+        logger.info("[snapshot:%s] refreshed", self.name)
+        return snapshot
+
+    def invalidate(self) -> None:
+        """
+        수동 무효화 훅.
+        백그라운드 갱신 스레드가 돌고 있으면 즉시 다시 로드하도록 깨우고,
+        없으면 스냅샷을 버려서 다음 get() 때 새로 로드되게 한다.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._wake.set()
+            return
+        with self._lock:
+            self._snapshot = None
+
+    # ------------------ 백그라운드 갱신 ------------------ #
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"snapshot-{self.name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        # 시작하자마자 한 번 로드하고, 이후 ttl_sec 마다 (또는 invalidate 시) 갱신
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning("[snapshot:%s] refresh failed, keeping previous: %s", self.name, e)
+
+            self._wake.wait(timeout=self._ttl_sec)
+            self._wake.clear()
@@ -0,0 +1,61 @@
+# app/modules/facility/sport_index.py
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+class SportMatcher:
+    """
+    종목명 사전(정규화된 문자열)에 대한 Aho–Corasick 매처.
+    시설 유형 문자열(ftype_nm)을 한 번만 훑으면서 포함된 종목을 전부 찾는다.
+    - 종목 ID 는 사전에 넣은 순서 (0, 1, 2, ...)
+    - 빈 문자열이나 중복 종목명은 무시
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names: List[str] = list(dict.fromkeys(n for n in names if n))
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        # trie: 상태별 전이(goto), 실패 링크(fail), 그 상태에서 끝나는 종목 ID 들(out)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for sid, name in enumerate(self.names):
+            state = 0
+            for ch in name:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(sid)
+
+        # BFS 로 실패 링크를 달고, 실패 링크 쪽 출력도 합쳐 둔다
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def find_ids(self, text: str) -> List[int]:
+        """text 에 부분문자열로 들어 있는 종목 ID 들을 오름차순으로 반환."""
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            if self._out[state]:
+                found.update(self._out[state])
+        return sorted(found)
@@ -0,0 +1,161 @@
+# app/modules/facility/store.py
+"""
+로컬 시설 저장소 (열 단위 .npy 파일 묶음).
+
+Supabase 에 올라가 있는 시설 / 운동강도 / 선호종목 데이터를 미리 한 디렉터리로 떠 두고,
+서버는 시작할 때 REST 로 세 번 내려받는 대신 이 파일들을 메모리 맵(mmap)으로 연다.
+여러 워커가 같은 파일을 열면 OS 페이지 캐시를 같이 쓰게 된다.
+
+디렉터리 구성
+- meta.json: 버전, 건수, 종목 사전 순서, 강도 목록, intensity_map, sports_pref
+- columns/<이름>.npy: FacilityColumns 의 열 배열 (위도순 정렬 상태 그대로)
+- rows/<필드>.npy: 응답에 쓰는 원본 필드 (같은 위도순)
+
+만들기:  python -m app.modules.facility.store export <디렉터리>
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Sequence
+
+import numpy as np
+
+from .engine import FacilityColumns
+from .snapshot import FacilitySnapshot
+
+STORE_VERSION = 1
+
+# 추천 응답에 나가는 시설 필드 (songpa_sports_data 컬럼)
+ROW_FIELDS = ("faci_cd", "faci_nm", "faci_addr", "ftype_nm", "inout_gbn_nm")
+
+
+class FacilityRows(Sequence):
+    """
+    rows/*.npy 열들을 facilities 리스트처럼 보이게 하는 읽기 전용 뷰.
+    i 번째 시설을 꺼낼 때만 dict 를 만든다.
+    """
+
+    def __init__(self, fields: Dict[str, np.ndarray], lat: np.ndarray, lon: np.ndarray) -> None:
+        self._fields = fields
+        self._lat = lat
+        self._lon = lon
+
+    def __len__(self) -> int:
+        return len(self._lat)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:  # type: ignore[override]
+        row: Dict[str, Any] = {name: (str(col[i]) or None) for name, col in self._fields.items()}
+        row["faci_lat"] = float(self._lat[i])
+        row["faci_lot"] = float(self._lon[i])
+        return row
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+# ------------------ 내보내기 ------------------ #
+def export_facility_store(snapshot: FacilitySnapshot, path: str) -> None:
+    """
+    스냅샷을 path 디렉터리에 저장.
+    임시 디렉터리에 다 쓴 다음 한 번에 바꿔 끼워서, 읽는 쪽이 반쯤 쓰인 파일을 보지 않게 한다.
+    (이미 mmap 으로 열어 둔 워커는 다음 갱신 때까지 이전 파일을 그대로 본다)
+    """
+    columns = snapshot.columns
+    arrays = columns.to_arrays()
+    # 저장소 안에서는 rows/ 도 위도순이라 row 는 그냥 0..N-1
+    arrays["row"] = np.arange(len(columns), dtype=np.int64)
+
+    ordered = [snapshot.facilities[int(i)] for i in columns.row]
+
+    tmp = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(os.path.join(tmp, "columns"))
+    os.makedirs(os.path.join(tmp, "rows"))
+
+    for name, arr in arrays.items():
+        np.save(os.path.join(tmp, "columns", f"{name}.npy"), np.ascontiguousarray(arr))
+    for name in ROW_FIELDS:
+        values = [str(r.get(name) or "") for r in ordered]
+        np.save(os.path.join(tmp, "rows", f"{name}.npy"), np.array(values, dtype=str))
+
+    meta = {
+        "version": STORE_VERSION,
+        "created_at": time.time(),
+        "count": len(columns),
+        "sport_names": columns.matcher.names,
+        "intensity_levels": columns.intensity_levels,
+        "intensity_map": dict(snapshot.intensity_map),
+        "sports_pref": [
+            [ages, gender, list(sports)]
+            for (ages, gender), sports in snapshot.sports_pref.items()
+        ],
+    }
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    old = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.rename(path, old)
+    os.rename(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+# ------------------ 불러오기 ------------------ #
+def load_facility_store(path: str) -> FacilitySnapshot:
+    """path 의 저장소를 메모리 맵으로 열어 FacilitySnapshot 으로 반환."""
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != STORE_VERSION:
+        raise RuntimeError(
+            f"시설 저장소 버전이 다릅니다: {meta.get('version')} (필요: {STORE_VERSION})"
+        )
+
+    def _open(*parts: str) -> np.ndarray:
+        return np.load(os.path.join(path, *parts), mmap_mode="r")
+
+    arrays = {name: _open("columns", f"{name}.npy") for name in FacilityColumns.ARRAY_FIELDS}
+    columns = FacilityColumns.from_arrays(
+        arrays,
+        sport_names=meta["sport_names"],
+        intensity_levels=meta["intensity_levels"],
+    )
+    if len(columns) != meta["count"]:
+        raise RuntimeError(f"시설 저장소가 손상됐습니다: {path}")
+
+    fields = {name: _open("rows", f"{name}.npy") for name in ROW_FIELDS}
+    sports_pref: Mapping = MappingProxyType(
+        {(ages, gender): tuple(sports) for ages, gender, sports in meta["sports_pref"]}
+    )
+    return FacilitySnapshot(
+        facilities=FacilityRows(fields, columns.lat, columns.lon),
+        intensity_map=meta["intensity_map"],
+        sports_pref=sports_pref,
+        columns=columns,
+    )
+
+
+# ------------------ CLI ------------------ #
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.modules.facility.store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="Supabase 의 시설 데이터를 로컬 저장소로 내보내기")
+    export.add_argument("path", help="저장할 디렉터리 (FACILITY_STORE_PATH 에 넣을 경로)")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        # Supabase 에서 읽어오는 건 app.db 의 기존 로더를 그대로 쓴다
+        from app.db import _load_facility_snapshot_from_supabase
+
+        snapshot = _load_facility_snapshot_from_supabase()
+        export_facility_store(snapshot, args.path)
+        print(f"시설 {len(snapshot.columns)}건 -> {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -5,6 +5,8 @@ from datetime import datetime, timedelta, timezone
 from typing import List
 
 from app.core.supabase import get_supabase_client
+from app.modules.auth.loader import ProfileLoader
+from app.modules.auth.service import invalidate_user_profile
 
 from .schemas import (
     FeedbackStatus,
@@ -47,8 +49,9 @@ def _update_manner_temp(current_temp: float, ratings: list[int]) -> float:
 
 
 class FeedbackRepository:
-    def __init__(self) -> None:
+    def __init__(self, profiles: ProfileLoader | None = None) -> None:
         self._client = get_supabase_client()
+        self.profiles = profiles or ProfileLoader()
 
     # 1) 내가 참여한 파티 + 피드백 상태
     def get_my_parties(self, user_id: str) -> List[MyPartyFeedback]:
@@ -142,21 +145,14 @@ class FeedbackRepository:
         if not member_ids:
             return []
 
-        # 멤버 프로필 조회 (닉네임 + 현재 스포츠맨십)
-        profile_res = (
-            self._client.table("app.user_profile")
-            .select("id, nickname, sportsmanship")
-            .in_("id", list(member_ids))
-            .execute()
-        )
-        if profile_res.error:
-            raise RuntimeError(f"Supabase error (user_profile for targets): {profile_res.error}")
+        # 멤버 프로필 조회 (닉네임 + 현재 스포츠맨십): 프로필 캐시 -> 없는 것만 in.(...) 한 번
+        profiles = self.profiles.load_many_sync(member_ids)
 
         targets: List[FeedbackTarget] = []
-        for row in profile_res.data:
+        for user_id, row in profiles.items():
             targets.append(
                 FeedbackTarget(
-                    user_id=row["id"],
+                    user_id=user_id,
                     nickname=row.get("nickname") or "알 수 없음",
                     sportsmanship=row.get("sportsmanship"),
                 )
@@ -220,6 +216,7 @@ class FeedbackRepository:
         """
         user_profile.sportsmanship 를 현재 매너온도로 보고
         이번 파티에서 받은 별점 리스트(ratings_this_party)를 사용해 업데이트.
+        user_id 는 party_member.user_id 와 같은 user_profile.uuid (평가 대상 조회와 같은 컬럼).
         """
 
         if not ratings_this_party:
@@ -229,7 +226,7 @@ class FeedbackRepository:
         cur_res = (
             self._client.table("app.user_profile")
             .select("sportsmanship")
-            .eq("id", user_id)
+            .eq("uuid", user_id)
             .single()
             .execute()
         )
@@ -247,6 +244,8 @@ class FeedbackRepository:
         _ = (
             self._client.table("app.user_profile")
             .update({"sportsmanship": new_temp})
-            .eq("id", user_id)
+            .eq("uuid", user_id)
             .execute()
         )
+        # 인증 의존성이 들고 있는 프로필 캐시에 옛 매너온도가 남지 않게
+        invalidate_user_profile(user_id)
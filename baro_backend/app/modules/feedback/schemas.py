@@ -25,7 +25,7 @@ class MyPartyFeedback(BaseModel):
 class FeedbackTarget(BaseModel):
     user_id: str
     nickname: str
-    sportsmanship: Optional[int] = None
+    sportsmanship: Optional[float] = None
 
     class Config:
         orm_mode = True
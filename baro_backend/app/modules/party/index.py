@@ -0,0 +1,297 @@
+# app/modules/party/index.py
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.geo import GridIndex
+
+from .schemas import Party
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+# 인덱스에 올리는(= 모집 중인) 파티 상태
+OPEN_STATUS = "open"
+
+
+def _parse_starts_at(date: Optional[str], start_time: Optional[str]) -> Optional[datetime]:
+    """party.date('YYYY-MM-DD') + start_time('HH:MM' 또는 'HH:MM:SS') -> KST datetime. 못 읽으면 None."""
+    if not date:
+        return None
+    text = f"{date} {start_time or '00:00'}"
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(text, fmt).replace(tzinfo=KST)
+        except ValueError:
+            continue
+    return None
+
+
+def party_window(
+    date: Optional[str], start_time: Optional[str], end_time: Optional[str]
+) -> Optional[Tuple[datetime, datetime]]:
+    """파티 (시작, 끝) KST datetime. 끝 시각이 없으면 시작 = 끝, 자정을 넘기면 다음 날로."""
+    starts_at = _parse_starts_at(date, start_time)
+    if starts_at is None:
+        return None
+    ends_at = _parse_starts_at(date, end_time) if end_time else None
+    if ends_at is None:
+        ends_at = starts_at
+    elif ends_at < starts_at:
+        ends_at += timedelta(days=1)
+    return starts_at, ends_at
+
+
+@dataclass(frozen=True)
+class IndexedParty:
+    """인덱스에 들고 있는 파티 요약 (멤버 목록 없이 검색/응답에 필요한 것만)."""
+    party_id: str
+    title: str
+    sport: str
+    place: str
+    date: str
+    start_time: str
+    end_time: str
+    capacity: int
+    current: int
+    host_id: str
+    place_lat: float
+    place_lng: float
+    starts_at: Optional[datetime]
+    status: str = OPEN_STATUS
+    description: str = ""
+
+    @property
+    def free_slots(self) -> int:
+        return max(0, self.capacity - self.current)
+
+    @property
+    def window(self) -> Optional[Tuple[datetime, datetime]]:
+        return party_window(self.date, self.start_time, self.end_time)
+
+    @classmethod
+    def from_party(cls, party: Party) -> Optional["IndexedParty"]:
+        """모집 중이고 위치가 있는 파티만 인덱스 대상. 아니면 None."""
+        if party.status != OPEN_STATUS or party.place_lat is None or party.place_lng is None:
+            return None
+        return cls(
+            party_id=party.party_id,
+            title=party.title,
+            sport=party.sport,
+            place=party.place,
+            date=party.date,
+            start_time=party.start_time,
+            end_time=party.end_time,
+            capacity=party.capacity,
+            current=party.current,
+            host_id=party.host_id,
+            place_lat=party.place_lat,
+            place_lng=party.place_lng,
+            starts_at=_parse_starts_at(party.date, party.start_time),
+            status=party.status,
+            description=party.description,
+        )
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> Optional["IndexedParty"]:
+        """party 테이블 row -> IndexedParty. 위치가 없거나 숫자가 아니면 None."""
+        if (row.get("status") or OPEN_STATUS) != OPEN_STATUS:
+            return None
+        try:
+            lat = float(row["place_lat"])
+            lng = float(row["place_lng"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        capacity = row.get("capacity")
+        if capacity is None:
+            capacity = row.get("capapcity")
+        return cls(
+            party_id=str(row["id"]),
+            title=row.get("title") or "",
+            sport=row.get("sport") or "",
+            place=row.get("place") or "",
+            date=row.get("date") or "",
+            start_time=row.get("start_time") or "",
+            end_time=row.get("end_time") or "",
+            capacity=capacity or 0,
+            current=row.get("current") or 0,
+            host_id=str(row.get("host_id") or ""),
+            place_lat=lat,
+            place_lng=lng,
+            starts_at=_parse_starts_at(row.get("date"), row.get("start_time")),
+            status=row.get("status") or OPEN_STATUS,
+            description=row.get("description") or "",
+        )
+
+
+class PartyGeoIndex:
+    """
+    모집 중인 파티를 위치(place_lat/place_lng) 격자 + 시작 시각으로 들고 있는 프로세스 내 인덱스.
+    - PartyRepository 가 생성/참여/탈퇴할 때마다 upsert() 로 바로 반영
+    - start() 하면 rebuild_sec 마다 DB 에서 통째로 다시 만들어서 다른 워커/직접 수정분도 따라잡음
+    - search(): "반경 N km, 앞으로 M 시간 안, 빈자리 있음" 같은 조건을 메모리에서 바로 답함
+    재구성하는 동안 들어온 upsert/remove 는 따로 모아 뒀다가 새 인덱스에 다시 적용한다.
+    """
+
+    def __init__(self, cell_km: float = 1.0) -> None:
+        self._cell_km = cell_km
+        self._grid = GridIndex(cell_km=cell_km)
+        self._parties: Dict[str, IndexedParty] = {}
+        self._lock = threading.Lock()
+        self._pending: Optional[Dict[str, Optional[IndexedParty]]] = None
+        self._loaded = False
+
+        self._loader: Optional[Callable[[], Iterable[Dict[str, Any]]]] = None
+        self._rebuild_sec = 0.0
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._parties)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    # ------------------ 쓰기 반영 ------------------ #
+    def upsert(self, party: Party) -> None:
+        """파티 최신 상태 반영. 모집 마감/위치 없음이면 인덱스에서 뺀다."""
+        self._apply(party.party_id, IndexedParty.from_party(party))
+
+    def remove(self, party_id: str) -> None:
+        self._apply(str(party_id), None)
+
+    def _apply(self, party_id: str, item: Optional[IndexedParty]) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending[party_id] = item
+            self._put(self._grid, self._parties, party_id, item)
+
+    @staticmethod
+    def _put(
+        grid: GridIndex,
+        parties: Dict[str, IndexedParty],
+        party_id: str,
+        item: Optional[IndexedParty],
+    ) -> None:
+        if item is None:
+            grid.remove(party_id)
+            parties.pop(party_id, None)
+        else:
+            grid.insert(party_id, item.place_lat, item.place_lng)
+            parties[party_id] = item
+
+    # ------------------ 재구성 ------------------ #
+    def rebuild(self, rows: Optional[Iterable[Dict[str, Any]]] = None) -> None:
+        """party row 들로 인덱스를 새로 만들어 교체. rows 를 안 주면 start() 때 받은 loader 로 읽는다."""
+        with self._lock:
+            self._pending = {}
+        try:
+            if rows is None:
+                if self._loader is None:
+                    raise RuntimeError("party index loader is not configured")
+                rows = self._loader()
+
+            grid = GridIndex(cell_km=self._cell_km)
+            parties: Dict[str, IndexedParty] = {}
+            for row in rows:
+                item = IndexedParty.from_row(row)
+                if item is not None:
+                    self._put(grid, parties, item.party_id, item)
+
+            with self._lock:
+                # 읽어 오는 동안 들어온 변경이 DB 스냅샷보다 최신이니 그걸 우선
+                for party_id, item in self._pending.items():
+                    self._put(grid, parties, party_id, item)
+                self._grid = grid
+                self._parties = parties
+                self._loaded = True
+        finally:
+            with self._lock:
+                self._pending = None
+        logger.info("[party-index] rebuilt: %d open parties", len(parties))
+
+    def start(self, loader: Callable[[], Iterable[Dict[str, Any]]], rebuild_sec: float) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._loader = loader
+        self._rebuild_sec = rebuild_sec
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="party-index", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.rebuild()
+            except Exception as e:
+                logger.warning("[party-index] rebuild failed, keeping previous: %s", e)
+            self._wake.wait(timeout=self._rebuild_sec)
+            self._wake.clear()
+
+    # ------------------ 조회 ------------------ #
+    def get(self, party_id: str) -> Optional[IndexedParty]:
+        return self._parties.get(str(party_id))
+
+    def search(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        within_hours: Optional[float] = None,
+        only_available: bool = False,
+        sport: Optional[str] = None,
+        limit: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ) -> List[Tuple[IndexedParty, float]]:
+        """
+        반경 radius_km 안의 모집 중 파티를 (파티, 거리 km) 로 가까운 순서대로 반환.
+        - within_hours: 지금부터 그 시간 안에 시작하는 파티만 (시작 시각을 모르면 제외)
+        - only_available: 빈자리가 있는 파티만
+        - sport: 종목명이 정확히 같은 파티만
+        """
+        window: Optional[Tuple[datetime, datetime]] = None
+        if within_hours is not None:
+            start = now or datetime.now(KST)
+            window = (start, start + timedelta(hours=within_hours))
+
+        def matches(party_id: str) -> bool:
+            item = parties.get(party_id)
+            if item is None:
+                return False
+            if only_available and item.free_slots <= 0:
+                return False
+            if sport is not None and item.sport != sport:
+                return False
+            if window is not None and (
+                item.starts_at is None or not window[0] <= item.starts_at <= window[1]
+            ):
+                return False
+            return True
+
+        # 조건은 거리 계산 전에 먼저 거르고, limit 이 있으면 가까운 셀부터 넓혀 가다 다 차면 멈춤.
+        # 격자와 파티 dict 는 같은 락 안에서 읽어야 재구성/삭제와 어긋나지 않는다
+        with self._lock:
+            parties = self._parties
+            if limit is None:
+                found = self._grid.within(lat, lon, radius_km, predicate=matches)
+            else:
+                found = self._grid.nearest(
+                    lat, lon, limit, max_radius_km=radius_km, predicate=matches
+                )
+            return [(parties[party_id], distance) for party_id, distance in found]
+
+
+# 프로세스 전체에서 같이 쓰는 인덱스 (PartyRepository 가 쓰기 때마다 갱신)
+party_index = PartyGeoIndex()
@@ -1,30 +1,87 @@
 # app/modules/party/repository.py
 
-from datetime import datetime, timezone
-from typing import Dict, List, Optional
+import asyncio
+import base64
+import json
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
+from .index import OPEN_STATUS, party_index
 from .schemas import CreatePartyRequest, Party, PartyMember
-from app.modules.auth.service import _sb_get, _sb_post, _sb_patch
+from app.core.geo import bounding_box, haversine_km
+from app.modules.auth.loader import ProfileLoader
+from app.modules.auth.service import (
+    _sb_get,
+    _sb_get_async,
+    _sb_patch_async,
+    _sb_post_async,
+)
+
+logger = logging.getLogger(__name__)
 
 TABLE_PARTY = "party"
 TABLE_PARTY_MEMBER = "party_member"
 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# party.id 형식 (정수 또는 uuid). 커서 값이 PostgREST 필터 문자열에 그대로 들어가서 엄격하게 본다
+_PARTY_ID_RE = re.compile(
+    r"[0-9]+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+
 
-def _row_to_party_member(row: Dict) -> PartyMember:
+def encode_party_cursor(created_at: str, party_id: Any) -> str:
+    """페이지 마지막 파티의 (created_at, id) -> 클라이언트에 넘기는 불투명한 커서 문자열."""
+    raw = json.dumps([created_at, str(party_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_party_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    encode_party_cursor 의 반대. 형식이 틀리면 ValueError.
+    클라이언트가 보낸 값이라 created_at 은 시각으로 다시 읽어서 정규화하고,
+    id 는 party id 형식인지 확인한 뒤에만 돌려준다 (따옴표/괄호로 필터를 바꾸지 못하게).
     """
-    party_member row -> PartyMember DTO 변환
-    sportsmanship 은 user_profile 에 있으니까 일단 None으로 두고,
-    나중에 필요하면 조인해서 채워 넣으면 됨.
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, party_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+    if not isinstance(created_at, str) or not isinstance(party_id, str):
+        raise ValueError("invalid cursor")
+    try:
+        created_at = datetime.fromisoformat(created_at).isoformat()
+    except ValueError as e:
+        raise ValueError("invalid cursor") from e
+    if not _PARTY_ID_RE.fullmatch(party_id):
+        raise ValueError("invalid cursor")
+    return created_at, party_id
+
+
+def _profile_nickname(profile: Optional[Dict]) -> str:
+    """party_member.nickname 에 저장할 값 (프로필이 없거나 닉네임이 비었으면 "")."""
+    return (profile or {}).get("nickname") or ""
+
+
+def _row_to_party_member(row: Dict, profile: Optional[Dict] = None) -> PartyMember:
     """
+    party_member row (+ 그 유저의 user_profile row) -> PartyMember DTO 변환
+    닉네임은 party_member 에 저장된 값이 비어 있으면 프로필 닉네임,
+    sportsmanship 은 프로필에서 (ProfileLoader 로 한 번에 읽어 온 것).
+    """
+    profile = profile or {}
     return PartyMember(
         party_id=row["party_id"],
         user_id=row["user_id"],
-        nickname=row.get("nickname") or "",
+        nickname=row.get("nickname") or profile.get("nickname") or "",
         role=row.get("role") or "member",
         status=row.get("status") or "joined",
         joined_at=row.get("joined_at") or "",
-        sportsmanship=None,
+        sportsmanship=profile.get("sportsmanship"),
     )
 
 
@@ -79,25 +136,115 @@ class PartyRepository:
     """
     Supabase REST(_sb_get/_sb_post/_sb_patch)로
     party, party_member 테이블을 직접 때리는 레이어
+    생성/참여/탈퇴 후에는 최신 Party 로 위치 인덱스(party_index)도 같이 갱신한다.
+    라우트에서 쓰는 메서드는 async (이벤트 루프를 막지 않음),
+    백그라운드 스레드에서 도는 list_open_party_rows 만 동기.
+    멤버 프로필(닉네임, 매너온도)은 요청 단위 ProfileLoader 로 모아서 한 번에 읽는다.
     """
 
-    # 리스트
-    def list_parties(self, user_id: Optional[UUID]) -> List[Party]:
-        # 1) party 전체 조회
-        party_rows = _sb_get(
+    def __init__(self, profiles: Optional[ProfileLoader] = None) -> None:
+        self.profiles = profiles or ProfileLoader()
+
+    async def _member_profiles(self, member_rows: List[Dict]) -> Dict[str, Dict]:
+        """
+        멤버들의 user_profile (매너온도/닉네임 보충용). 프로필 조회가 실패해도 파티 조회는 되도록
+        로그만 남기고 빈 dict (sportsmanship 없음, 저장된 닉네임만 사용).
+        """
+        try:
+            return await self.profiles.load_many(r["user_id"] for r in member_rows)
+        except Exception as e:
+            logger.warning("[party] member profile load failed: %r", e)
+            return {}
+
+    # 위치 인덱스 재구성용: 모집 중이고 위치가 있는 파티 row 전체
+    def list_open_party_rows(self) -> List[Dict]:
+        return _sb_get(
             TABLE_PARTY,
             {
                 "select": (
-                    "id,title,sport,place,description,date,"
-                    "start_time,end_time,capacity,capapcity,current,"
-                    "host_id,status,created_at,place_lat,place_lng"
+                    "id,title,sport,place,description,date,start_time,end_time,"
+                    "capacity,capapcity,current,host_id,status,place_lat,place_lng"
                 ),
-                "order": "created_at.desc",
+                "status": f"eq.{OPEN_STATUS}",
+                "place_lat": "not.is.null",
+                "place_lng": "not.is.null",
             },
         )
 
+    # 리스트 (created_at, id 기준 keyset 페이지)
+    async def list_parties(
+        self,
+        user_id: Optional[UUID],
+        size: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sport: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        status: Optional[str] = None,
+        near: Optional[Tuple[float, float, float]] = None,
+    ) -> Tuple[List[Party], Optional[str]]:
+        """
+        최신순 파티 한 페이지와 다음 페이지 커서 (마지막 페이지면 None).
+        - cursor: 이전 페이지가 돌려준 값. (created_at, id) 가 그보다 작은 것부터 size 개
+        - sport / status: 정확히 같은 값, date_from ~ date_to: party.date 범위 (양끝 포함)
+        - near=(lat, lng, radius_km): 반경을 덮는 위경도 사각형은 쿼리로 거르고, 정확한 거리는 받아서 다시 거름
+          (그래서 거리 조건이 있으면 한 페이지가 size 보다 적을 수 있다)
+        쿼리는 페이지당 party (size + 1 행) 한 번 + 그 파티들의 party_member 한 번.
+        """
+        params: Dict[str, Any] = {
+            "select": (
+                "id,title,sport,place,description,date,"
+                "start_time,end_time,capacity,capapcity,current,"
+                "host_id,status,created_at,place_lat,place_lng"
+            ),
+            "order": "created_at.desc,id.desc",
+            "limit": size + 1,  # 한 행 더 받아서 다음 페이지가 있는지 판단
+        }
+        if sport:
+            params["sport"] = f"eq.{sport}"
+        if status:
+            params["status"] = f"eq.{status}"
+
+        conditions: List[str] = []
+        if date_from is not None:
+            conditions.append(f"date.gte.{date_from.isoformat()}")
+        if date_to is not None:
+            conditions.append(f"date.lte.{date_to.isoformat()}")
+        if near is not None:
+            min_lat, max_lat, min_lng, max_lng = bounding_box(*near)
+            conditions += [
+                f"place_lat.gte.{min_lat}",
+                f"place_lat.lte.{max_lat}",
+                f"place_lng.gte.{min_lng}",
+                f"place_lng.lte.{max_lng}",
+            ]
+        if cursor is not None:
+            created_at, last_id = decode_party_cursor(cursor)
+            conditions.append(
+                f'or(created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt."{last_id}"))'
+            )
+        if conditions:
+            params["and"] = f"({','.join(conditions)})"
+
+        # 1) party 한 페이지 조회
+        party_rows = await _sb_get_async(TABLE_PARTY, params)
+
+        next_cursor: Optional[str] = None
+        if len(party_rows) > size:
+            party_rows = party_rows[:size]
+            last = party_rows[-1]
+            next_cursor = encode_party_cursor(last["created_at"], last["id"])
+
+        if near is not None:
+            lat, lng, radius_km = near
+            party_rows = [
+                r for r in party_rows
+                if haversine_km(lat, lng, float(r["place_lat"]), float(r["place_lng"])) <= radius_km
+            ]
+
         if not party_rows:
-            return []
+            return [], next_cursor
 
         # 2) party_id 리스트 만들기
         party_ids = [str(r["id"]) for r in party_rows]
@@ -106,7 +253,7 @@ class PartyRepository:
         # 3) 해당 party 들의 멤버 전체 조회
         member_rows: List[Dict] = []
         if party_ids:
-            member_rows = _sb_get(
+            member_rows = await _sb_get_async(
                 TABLE_PARTY_MEMBER,
                 {
                     "select": "id,party_id,user_id,nickname,role,joined_at,status",
@@ -116,9 +263,12 @@ class PartyRepository:
 
         # 4) party_id 기준으로 멤버 묶기
         members_by_party: Dict[str, List[PartyMember]] = {}
+        profiles = await self._member_profiles(member_rows)
         for row in member_rows:
             pid = str(row["party_id"])
-            members_by_party.setdefault(pid, []).append(_row_to_party_member(row))
+            members_by_party.setdefault(pid, []).append(
+                _row_to_party_member(row, profiles.get(str(row["user_id"])))
+            )
 
         # 5) Party DTO 리스트로 변환
         result: List[Party] = []
@@ -127,40 +277,43 @@ class PartyRepository:
             members = members_by_party.get(pid, [])
             result.append(_build_party(p, members, user_id))
 
-        return result
+        return result, next_cursor
 
     # 상세
-    def get_party(self, party_id: str, user_id: Optional[UUID]) -> Party:
-        party_rows = _sb_get(
-            TABLE_PARTY,
-            {
-                "select": (
-                    "id,title,sport,place,description,date,"
-                    "start_time,end_time,capacity,capapcity,current,"
-                    "host_id,status,created_at,place_lat,place_lng"
-                ),
-                "id": f"eq.{party_id}",
-                "limit": 1,
-            },
+    async def get_party(self, party_id: str, user_id: Optional[UUID]) -> Party:
+        # party / 멤버 조회는 서로 기다릴 필요가 없어서 동시에 보냄
+        party_rows, member_rows = await asyncio.gather(
+            _sb_get_async(
+                TABLE_PARTY,
+                {
+                    "select": (
+                        "id,title,sport,place,description,date,"
+                        "start_time,end_time,capacity,capapcity,current,"
+                        "host_id,status,created_at,place_lat,place_lng"
+                    ),
+                    "id": f"eq.{party_id}",
+                    "limit": 1,
+                },
+            ),
+            _sb_get_async(
+                TABLE_PARTY_MEMBER,
+                {
+                    "select": "id,party_id,user_id,nickname,role,joined_at,status",
+                    "party_id": f"eq.{party_id}",
+                },
+            ),
         )
         if not party_rows:
             raise KeyError("party not found")
 
         party_row = party_rows[0]
-
-        member_rows = _sb_get(
-            TABLE_PARTY_MEMBER,
-            {
-                "select": "id,party_id,user_id,nickname,role,joined_at,status",
-                "party_id": f"eq.{party_id}",
-            },
-        )
-        members = [_row_to_party_member(r) for r in member_rows]
+        profiles = await self._member_profiles(member_rows)
+        members = [_row_to_party_member(r, profiles.get(str(r["user_id"]))) for r in member_rows]
 
         return _build_party(party_row, members, user_id)
 
     # 생성
-    def create_party(self, user_id: UUID, req: CreatePartyRequest) -> Party:
+    async def create_party(self, user_id: UUID, req: CreatePartyRequest) -> Party:
         now_iso = datetime.now(timezone.utc).isoformat()
 
         # 1) party insert
@@ -180,63 +333,75 @@ class PartyRepository:
             "place_lat": req.place_lat,
             "place_lng": req.place_lng,
         }
-        party_row = _sb_post(TABLE_PARTY, party_body)
+        # 닉네임은 party insert 와 동시에 프로필 로더로 읽어 둔다
+        party_row, profile = await asyncio.gather(
+            _sb_post_async(TABLE_PARTY, party_body),
+            self.profiles.load(str(user_id)),
+        )
         party_id = str(party_row["id"])
 
         # 2) host 멤버 insert
         member_body = {
             "party_id": party_id,
             "user_id": str(user_id),
-            # TODO: user_profile에서 닉네임 가져오거나, 서비스에서 주입받아 넣기
-            "nickname": "",
+            "nickname": _profile_nickname(profile),
             "role": "host",
             "status": "joined",
             "joined_at": now_iso,
         }
-        _sb_post(TABLE_PARTY_MEMBER, member_body)
+        await _sb_post_async(TABLE_PARTY_MEMBER, member_body)
 
         # 3) 완성된 Party 리턴 (멤버/현재 인원까지 포함)
-        return self.get_party(party_id=party_id, user_id=user_id)
+        party = await self.get_party(party_id=party_id, user_id=user_id)
+        party_index.upsert(party)
+        return party
 
     # 참여
-    def join_party(self, party_id: str, user_id: UUID) -> Party:
+    async def join_party(self, party_id: str, user_id: UUID) -> Party:
         uid_str = str(user_id)
         now_iso = datetime.now(timezone.utc).isoformat()
 
-        # 1) 이미 멤버인지 확인
-        existing = _sb_get(
-            TABLE_PARTY_MEMBER,
-            {
-                "select": "id,party_id,user_id,nickname,role,joined_at,status",
-                "party_id": f"eq.{party_id}",
-                "user_id": f"eq.{uid_str}",
-                "limit": 1,
-            },
+        # 1) 이미 멤버인지 확인 (참여자 닉네임도 같이 읽어 둠)
+        existing, profile = await asyncio.gather(
+            _sb_get_async(
+                TABLE_PARTY_MEMBER,
+                {
+                    "select": "id,party_id,user_id,nickname,role,joined_at,status",
+                    "party_id": f"eq.{party_id}",
+                    "user_id": f"eq.{uid_str}",
+                    "limit": 1,
+                },
+            ),
+            self.profiles.load(uid_str),
         )
+        nickname = _profile_nickname(profile)
 
         if not existing:
             # 없으면 새로 insert
             member_body = {
                 "party_id": party_id,
                 "user_id": uid_str,
-                "nickname": "",
+                "nickname": nickname,
                 "role": "member",
                 "status": "joined",
                 "joined_at": now_iso,
             }
-            _sb_post(TABLE_PARTY_MEMBER, member_body)
+            await _sb_post_async(TABLE_PARTY_MEMBER, member_body)
         else:
             # 있으면 status 갱신(예: left -> joined)
             row = existing[0]
             if row.get("status") != "joined":
-                _sb_patch(
+                patch = {"status": "joined", "joined_at": now_iso}
+                if not row.get("nickname") and nickname:
+                    patch["nickname"] = nickname  # 예전에 "" 로 들어간 row 도 이때 채움
+                await _sb_patch_async(
                     TABLE_PARTY_MEMBER,
                     {"id": f"eq.{row['id']}"},
-                    {"status": "joined", "joined_at": now_iso},
+                    patch,
                 )
 
         # 2) joined 인원 다시 세서 current 업데이트
-        member_rows = _sb_get(
+        member_rows = await _sb_get_async(
             TABLE_PARTY_MEMBER,
             {
                 "select": "id,party_id,user_id,status",
@@ -244,21 +409,23 @@ class PartyRepository:
             },
         )
         joined_count = sum(1 for r in member_rows if r.get("status") == "joined")
-        _sb_patch(
+        await _sb_patch_async(
             TABLE_PARTY,
             {"id": f"eq.{party_id}"},
             {"current": joined_count},
         )
 
         # 3) 최종 Party 반환
-        return self.get_party(party_id=party_id, user_id=user_id)
+        party = await self.get_party(party_id=party_id, user_id=user_id)
+        party_index.upsert(party)
+        return party
 
     # 탈퇴
-    def leave_party(self, party_id: str, user_id: UUID) -> Party:
+    async def leave_party(self, party_id: str, user_id: UUID) -> Party:
         uid_str = str(user_id)
 
         # 1) 멤버 row 찾기
-        existing = _sb_get(
+        existing = await _sb_get_async(
             TABLE_PARTY_MEMBER,
             {
                 "select": "id,party_id,user_id,nickname,role,joined_at,status",
@@ -269,19 +436,19 @@ class PartyRepository:
         )
         if not existing:
             # 애초에 참가한 적이 없으면 그냥 현재 상태 반환해도 되고, 에러를 던져도 됨
-            return self.get_party(party_id=party_id, user_id=user_id)
+            return await self.get_party(party_id=party_id, user_id=user_id)
 
         row = existing[0]
         if row.get("status") == "joined":
             # joined 상태인 경우에만 left로 변경
-            _sb_patch(
+            await _sb_patch_async(
                 TABLE_PARTY_MEMBER,
                 {"id": f"eq.{row['id']}"},
                 {"status": "left"},
             )
 
         # 2) joined 인원 다시 세서 current 업데이트
-        member_rows = _sb_get(
+        member_rows = await _sb_get_async(
             TABLE_PARTY_MEMBER,
             {
                 "select": "id,party_id,user_id,status",
@@ -289,11 +456,13 @@ class PartyRepository:
             },
         )
         joined_count = sum(1 for r in member_rows if r.get("status") == "joined")
-        _sb_patch(
+        await _sb_patch_async(
             TABLE_PARTY,
             {"id": f"eq.{party_id}"},
             {"current": joined_count},
         )
 
         # 3) 최종 Party 반환
-        return self.get_party(party_id=party_id, user_id=user_id)
+        party = await self.get_party(party_id=party_id, user_id=user_id)
+        party_index.upsert(party)
+        return party
@@ -1,9 +1,12 @@
 # app/modules/party/router.py
-from typing import List
+from datetime import date
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
 
-from .schemas import CreatePartyRequest, Party
+from .repository import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from .schemas import CreatePartyRequest, NearbyParty, Party
 from .service import PartyService
 
 # 기존 auth 모듈에 있는 의존성 가정
@@ -21,16 +24,77 @@ def get_party_service() -> PartyService:
 
 
 # GET /party  -> PartyApi.getPartyList()
+# 최신순 한 페이지씩. 다음 페이지가 있으면 X-Next-Cursor 헤더 값을 ?cursor= 로 다시 보내면 됨
 @router.get("", response_model=List[Party])
 async def get_party_list(
+    response: Response,
+    size: int = Query(DEFAULT_PAGE_SIZE, gt=0, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sport: Optional[str] = None,
+    date_from: Optional[date] = Query(None, alias="dateFrom"),
+    date_to: Optional[date] = Query(None, alias="dateTo"),
+    party_status: Optional[str] = Query(None, alias="status"),
+    lat: Optional[float] = None,
+    lng: Optional[float] = None,
+    radius_km: Optional[float] = Query(None, alias="radiusKm", gt=0, le=50),
     service: PartyService = Depends(get_party_service),
     user_id: str = Depends(get_current_user_id),   # 없으면 Optional[str]
 ):
-    parties = service.get_party_list(user_id=user_id)
+    near = None
+    if radius_km is not None:
+        if lat is None or lng is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="radiusKm requires lat and lng",
+            )
+        near = (lat, lng, radius_km)
+
+    try:
+        parties, next_cursor = await service.get_party_list(
+            user_id=user_id,
+            size=size,
+            cursor=cursor,
+            sport=sport,
+            date_from=date_from,
+            date_to=date_to,
+            status=party_status,
+            near=near,
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
     # Party 모델은 alias 설정해놔서 JSON 키가 partyId, startTime 등으로 나갈 것
     return parties
 
 
+# GET /party/nearby?lat=..&lng=..  (/{party_id} 보다 먼저 등록해야 함)
+@router.get("/nearby", response_model=List[NearbyParty])
+async def get_nearby_parties(
+    lat: float,
+    lng: float,
+    radius_km: float = Query(3.0, alias="radiusKm", gt=0, le=50),
+    within_hours: Optional[float] = Query(None, alias="withinHours", gt=0),
+    only_available: bool = Query(False, alias="onlyAvailable"),
+    sport: Optional[str] = None,
+    limit: int = Query(20, gt=0, le=100),
+    service: PartyService = Depends(get_party_service),
+    user_id: str = Depends(get_current_user_id),
+):
+    # 인덱스 조회는 메모리지만, 처음 로드 / 날씨 예보 조회가 동기 I/O 라 스레드 풀에서
+    return await run_in_threadpool(
+        service.find_nearby_parties,
+        lat=lat,
+        lng=lng,
+        radius_km=radius_km,
+        within_hours=within_hours,
+        only_available=only_available,
+        sport=sport,
+        limit=limit,
+    )
+
+
 # GET /party/{partyId}  -> getPartyDetail()
 @router.get("/{party_id}", response_model=Party)
 async def get_party_detail(
@@ -38,7 +102,7 @@ async def get_party_detail(
     service: PartyService = Depends(get_party_service),
     user_id: str = Depends(get_current_user_id),
 ):
-    party = service.get_party_detail(party_id=party_id, user_id=user_id)
+    party = await service.get_party_detail(party_id=party_id, user_id=user_id)
     if not party:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Party not found")
     return party
@@ -51,7 +115,7 @@ async def create_party(
     service: PartyService = Depends(get_party_service),
     user_id: str = Depends(get_current_user_id),
 ):
-    party = service.create_party(user_id=user_id, req=req)
+    party = await service.create_party(user_id=user_id, req=req)
     return party
 
 
@@ -62,7 +126,7 @@ async def join_party(
     service: PartyService = Depends(get_party_service),
     user_id: str = Depends(get_current_user_id),
 ):
-    party = service.join_party(party_id=party_id, user_id=user_id)
+    party = await service.join_party(party_id=party_id, user_id=user_id)
     return party
 
 
@@ -73,5 +137,5 @@ async def leave_party(
     service: PartyService = Depends(get_party_service),
     user_id: str = Depends(get_current_user_id),
 ):
-    party = service.leave_party(party_id=party_id, user_id=user_id)
+    party = await service.leave_party(party_id=party_id, user_id=user_id)
     return party
\ No newline at end of file
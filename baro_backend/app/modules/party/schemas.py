@@ -26,7 +26,7 @@ class PartyMember(BaseModel):
     role: str              # "host" / "member"
     status: str            # "joined" / "left" / "kicked"
     joined_at: str
-    sportsmanship: Optional[int] = None
+    sportsmanship: Optional[float] = None  # user_profile.sportsmanship (매너온도, 예: 36.5)
 
 
 class Party(BaseModel):
@@ -53,3 +53,28 @@ class Party(BaseModel):
     class Config:
         populate_by_name = True   # 내부에서 party_id로 세팅해도 응답 JSON은 partyId로 나감
         orm_mode = True           # DB row -> 모델 변환 편하게
+
+
+class NearbyParty(BaseModel):
+    # 위치 인덱스에서 바로 내려주는 요약 (멤버 목록 없음)
+    party_id: str = Field(alias="partyId")
+    title: str
+    sport: str
+    place: str
+    date: str
+    start_time: str = Field(alias="startTime")
+    end_time: str = Field(alias="endTime")
+    capacity: int
+    current: int
+    free_slots: int = Field(alias="freeSlots")
+    host_id: str = Field(alias="hostId")
+    status: str
+    place_lat: float = Field(alias="placeLat")
+    place_lng: float = Field(alias="placeLng")
+    distance_km: float = Field(alias="distanceKm")
+    description: str = ""
+    # 파티 시간대 예보상 비/눈 또는 너무 춥거나 더움 (예보가 없으면 None)
+    indoor_only: Optional[bool] = Field(None, alias="indoorOnly")
+
+    class Config:
+        populate_by_name = True
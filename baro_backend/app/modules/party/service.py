@@ -1,28 +1,111 @@
 # app/modules/party/service.py
-from typing import List, Optional
+from datetime import date
+from typing import Dict, List, Optional, Tuple
 
-from .repository import PartyRepository
-from .schemas import CreatePartyRequest, Party
+from app.modules.bot.forecast import indoor_only_during
+from app.modules.bot.kma_grid import latlon_to_grid
+
+from .index import PartyGeoIndex, party_index
+from .repository import DEFAULT_PAGE_SIZE, PartyRepository
+from .schemas import CreatePartyRequest, NearbyParty, Party
 
 
 class PartyService:
-    def __init__(self, repo: PartyRepository | None = None):
+    def __init__(self, repo: PartyRepository | None = None, index: PartyGeoIndex | None = None):
         self.repo = repo or PartyRepository()
+        self.index = index or party_index
 
-    def get_party_list(self, user_id: Optional[str]) -> List[Party]:
-        return self.repo.list_parties(user_id=user_id)
+    async def get_party_list(
+        self,
+        user_id: Optional[str],
+        size: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sport: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        status: Optional[str] = None,
+        near: Optional[Tuple[float, float, float]] = None,
+    ) -> Tuple[List[Party], Optional[str]]:
+        # (파티 한 페이지, 다음 페이지 커서). 커서 형식이 틀리면 ValueError
+        return await self.repo.list_parties(
+            user_id=user_id,
+            size=size,
+            cursor=cursor,
+            sport=sport,
+            date_from=date_from,
+            date_to=date_to,
+            status=status,
+            near=near,
+        )
 
-    def get_party_detail(self, party_id: str, user_id: Optional[str]) -> Party:
-        return self.repo.get_party(party_id=party_id, user_id=user_id)
+    async def get_party_detail(self, party_id: str, user_id: Optional[str]) -> Party:
+        return await self.repo.get_party(party_id=party_id, user_id=user_id)
 
-    def create_party(self, user_id: str, req: CreatePartyRequest) -> Party:
+    async def create_party(self, user_id: str, req: CreatePartyRequest) -> Party:
         # 여기서 capacity 체크, 날짜/시간 검증 같은 것 넣을 수 있음
-        return self.repo.create_party(user_id=user_id, req=req)
+        return await self.repo.create_party(user_id=user_id, req=req)
 
-    def join_party(self, party_id: str, user_id: str) -> Party:
+    async def join_party(self, party_id: str, user_id: str) -> Party:
         # ex) 이미 조인했으면 에러, capacity 초과면 에러
-        return self.repo.join_party(party_id=party_id, user_id=user_id)
+        return await self.repo.join_party(party_id=party_id, user_id=user_id)
 
-    def leave_party(self, party_id: str, user_id: str) -> Party:
+    async def leave_party(self, party_id: str, user_id: str) -> Party:
         # ex) host는 leave 안 된다거나 하는 정책
-        return self.repo.leave_party(party_id=party_id, user_id=user_id)
+        return await self.repo.leave_party(party_id=party_id, user_id=user_id)
+
+    def find_nearby_parties(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        within_hours: Optional[float] = None,
+        only_available: bool = False,
+        sport: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[NearbyParty]:
+        # DB 안 가고 위치 인덱스에서 바로 (아직 한 번도 안 읽었으면 그때만 DB)
+        if not self.index.loaded:
+            self.index.rebuild(self.repo.list_open_party_rows())
+        found = self.index.search(
+            lat,
+            lng,
+            radius_km,
+            within_hours=within_hours,
+            only_available=only_available,
+            sport=sport,
+            limit=limit,
+        )
+        # 파티 시간대 날씨는 (기상청 격자, 시간대) 마다 한 번만 본다 (예보 자체도 격자별 캐시)
+        weather: Dict[Tuple, Optional[bool]] = {}
+
+        def indoor_only(p) -> Optional[bool]:
+            window = p.window
+            if window is None:
+                return None
+            key = (latlon_to_grid(p.place_lat, p.place_lng), window)
+            if key not in weather:
+                weather[key] = indoor_only_during(p.place_lat, p.place_lng, *window)
+            return weather[key]
+
+        return [
+            NearbyParty(
+                party_id=p.party_id,
+                title=p.title,
+                sport=p.sport,
+                place=p.place,
+                date=p.date,
+                start_time=p.start_time,
+                end_time=p.end_time,
+                capacity=p.capacity,
+                current=p.current,
+                free_slots=p.free_slots,
+                host_id=p.host_id,
+                status=p.status,
+                place_lat=p.place_lat,
+                place_lng=p.place_lng,
+                distance_km=round(distance, 2),
+                description=p.description,
+                indoor_only=indoor_only(p),
+            )
+            for p, distance in found
+        ]
@@ -0,0 +1,242 @@
+# bench/recommend.py
+"""
+시설 추천(get_profiled_facilities) 벤치마크.
+
+Supabase / 기상청을 부르지 않도록 app.db 의 fetch 함수들과 is_indoor_only 를 가짜로 바꾸고,
+합성 데이터(송파구 범위 안 시설 N건 + 종목별 강도 + 연령/성별 선호 종목)로
+스냅샷 생성 시간, 요청 지연(p50/p95/p99), 처리량, 최대 메모리를 잰다.
+
+    cd baro_backend
+    python -m bench.recommend --sizes 1000,10000,100000,1000000 --out bench_recommend.json
+
+결과는 JSON 파일 하나 (커밋별로 떠 두고 비교하는 용도).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Mapping, Tuple
+
+# app.config 가 import 시점에 환경변수를 검사해서, 벤치용 가짜 값을 먼저 넣어 둔다
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+import numpy as np  # noqa: E402
+
+from app import db  # noqa: E402
+
+# 송파구 대략적인 범위
+LAT_RANGE = (37.47, 37.54)
+LON_RANGE = (127.05, 127.16)
+
+# 노트북(송파구 체육 시설 정보 데이터)에서 실제로 나오는 ftype_nm / 종목명
+FTYPES = [
+    "체력단련장", "유도", "간이운동장", "태권도", "축구장", "권투", "검도", "당구장", "골프연습장",
+    "스크린", "생활체육관", "테니스장", "구기체육관", "수영장", "기타시설", "야구장", "롤러스케이트장",
+    "사이클경기장", "투기체육관", "러닝", "풋살", "농구", "배드민턴", "탁구", "헬스", "볼링",
+    "요가", "필라테스", "주짓수", "복싱", "킥복싱", "레슬링", "합기도", "스크린야구",
+]
+SPORTS = [
+    "헬스", "유도", "간이운동", "태권도", "축구", "권투", "검도", "당구", "골프", "테니스",
+    "배드민턴", "수영", "복싱", "야구", "게이트볼", "농구", "롤러스케이팅", "풋살", "사이클",
+    "러닝", "탁구", "볼링", "요가", "필라테스", "주짓수", "킥복싱", "레슬링", "합기도", "스크린야구",
+]
+INTENSITIES = ["저", "중", "고"]
+AGE_BANDS = ["10대", "20대", "30대", "40대", "50대", "60대", "70대 이상"]
+GENDERS = ["남", "여"]
+
+
+# ------------------ 합성 데이터 ------------------ #
+def make_facilities(n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    rows = []
+    for i in range(n):
+        ftype = rng.choice(FTYPES)
+        if rng.random() < 0.2:
+            ftype = f"{ftype}, {rng.choice(FTYPES)}"
+        rows.append(
+            {
+                "faci_cd": str(i),
+                "faci_nm": f"시설{i}",
+                "faci_addr": "서울특별시 송파구",
+                "faci_lat": rng.uniform(*LAT_RANGE),
+                "faci_lot": rng.uniform(*LON_RANGE),
+                "ftype_nm": ftype,
+                "inout_gbn_nm": rng.choice(["실내", "실외", None]),
+            }
+        )
+    return rows
+
+
+def make_exercise_methods(n_sports: int, rng: random.Random) -> Dict[str, str]:
+    names = SPORTS + [f"종목{i}" for i in range(max(0, n_sports - len(SPORTS)))]
+    return {db._norm(name): rng.choice(INTENSITIES) for name in names[:n_sports]}
+
+
+def make_sports_pref(rng: random.Random) -> Mapping[Tuple[str, str], Tuple[str, ...]]:
+    return {
+        (band, gender): tuple(sorted(db._norm(s) for s in rng.sample(SPORTS, 5)))
+        for band in AGE_BANDS
+        for gender in GENDERS
+    }
+
+
+def make_profiles(n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            "user_lat": rng.uniform(*LAT_RANGE),
+            "user_lon": rng.uniform(*LON_RANGE),
+            "preferred_sports": rng.sample(SPORTS, rng.randint(0, 3)),
+            "age": rng.choice([None, 15, 25, 35, 45, 55, 65, 75]),
+            "gender": rng.choice([None, *GENDERS]),
+            "preferred_intensity": rng.choice([None, *INTENSITIES]),
+        }
+        for _ in range(n)
+    ]
+
+
+def install_stubs(facilities, intensity_map, sports_pref, indoor_ratio: float, rng: random.Random) -> None:
+    db.FACILITY_STORE_PATH = ""
+    db._fetch_all_facilities = lambda: facilities
+    db._fetch_exercise_methods = lambda: intensity_map
+    db._fetch_sports_pref = lambda: sports_pref
+    db.is_indoor_only = lambda lat, lon: rng.random() < indoor_ratio
+    db.facility_snapshots.invalidate()
+    db.recommendation_cache.clear()
+
+
+# ------------------ 측정 ------------------ #
+def _percentiles(samples_ms: List[float]) -> Dict[str, float]:
+    arr = np.asarray(samples_ms)
+    return {
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "p99": round(float(np.percentile(arr, 99)), 3),
+        "mean": round(float(arr.mean()), 3),
+        "max": round(float(arr.max()), 3),
+    }
+
+
+def bench_size(rows: int, args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    facilities = make_facilities(rows, rng)
+    install_stubs(
+        facilities,
+        make_exercise_methods(args.sports, rng),
+        make_sports_pref(rng),
+        args.indoor_ratio,
+        rng,
+    )
+    profiles = make_profiles(args.requests, rng)
+
+    # 스냅샷 생성 (열 배열 + 종목 매칭) 시간과 메모리
+    tracemalloc.start()
+    started = time.perf_counter()
+    db.facility_snapshots.get()
+    build_sec = time.perf_counter() - started
+    _, snapshot_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # 워밍업
+    for p in profiles[: args.warmup]:
+        db.get_profiled_facilities(limit=args.limit, **p)
+
+    # 요청 지연: 캐시를 끄고(매번 비움) 채점 경로 그대로 잰다
+    samples: List[float] = []
+    started = time.perf_counter()
+    for p in profiles:
+        if not args.with_cache:
+            db.recommendation_cache.clear()
+        t0 = time.perf_counter()
+        db.get_profiled_facilities(limit=args.limit, **p)
+        samples.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+
+    # 요청 처리 중 추가로 잡히는 메모리 (스냅샷 제외)
+    db.recommendation_cache.clear()
+    tracemalloc.start()
+    for p in profiles[: args.memory_requests]:
+        db.get_profiled_facilities(limit=args.limit, **p)
+    _, request_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # 배치 경로
+    started = time.perf_counter()
+    db.get_profiled_facilities_batch(profiles, limit=args.limit)
+    batch_sec = time.perf_counter() - started
+
+    result = {
+        "rows": rows,
+        "requests": len(profiles),
+        "snapshot_build_sec": round(build_sec, 3),
+        "snapshot_peak_mb": round(snapshot_peak / 2**20, 2),
+        "latency_ms": _percentiles(samples),
+        "throughput_rps": round(len(profiles) / elapsed, 1),
+        "request_peak_mb": round(request_peak / 2**20, 2),
+        "batch_sec": round(batch_sec, 3),
+        "batch_throughput_rps": round(len(profiles) / batch_sec, 1),
+        "cache": db.recommendation_cache_stats() if args.with_cache else None,
+    }
+    print(
+        f"rows={rows:>8} build={result['snapshot_build_sec']:.2f}s "
+        f"p50={result['latency_ms']['p50']:.2f}ms p95={result['latency_ms']['p95']:.2f}ms "
+        f"p99={result['latency_ms']['p99']:.2f}ms rps={result['throughput_rps']} "
+        f"batch_rps={result['batch_throughput_rps']}",
+        file=sys.stderr,
+    )
+    return result
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return ""
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.recommend")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000", help="시설 건수 목록 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=500, help="크기별 요청 수")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--memory-requests", type=int, default=50, help="메모리 측정용 요청 수")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--sports", type=int, default=len(SPORTS), help="종목(exercise_methods) 수")
+    parser.add_argument("--indoor-ratio", type=float, default=0.3, help="실내만 추천하는 날씨 비율")
+    parser.add_argument("--with-cache", action="store_true", help="추천 결과 캐시를 켠 채로 측정")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="bench_recommend.json", help="결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = [bench_size(rows, args) for rows in sizes]
+
+    report = {
+        "benchmark": "get_profiled_facilities",
+        "commit": _git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": vars(args),
+        # 프로세스 전체 최대 RSS (리눅스는 KB 단위)
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"-> {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
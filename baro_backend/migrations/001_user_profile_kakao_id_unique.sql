@@ -0,0 +1,5 @@
+-- 카카오 로그인은 kakao_id 충돌 시 insert 를 무시(on_conflict=kakao_id)하므로 unique 제약이 필요하다.
+-- 이미 중복 row 가 있으면 먼저 정리해야 제약이 걸린다:
+--   select kakao_id, count(*) from app.user_profile group by kakao_id having count(*) > 1;
+alter table app.user_profile
+    add constraint user_profile_kakao_id_key unique (kakao_id);
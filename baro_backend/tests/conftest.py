@@ -0,0 +1,7 @@
+# tests/conftest.py
+import os
+
+# app.config 가 import 시점에 환경변수를 검사해서, 테스트용 가짜 값을 먼저 넣어 둔다
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
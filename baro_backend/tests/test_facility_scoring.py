@@ -0,0 +1,86 @@
+# tests/test_facility_scoring.py
+import math
+import random
+
+import pytest
+
+from app.modules.facility.engine import _norm
+from app.modules.facility.snapshot import build_facility_snapshot
+
+SPORTS = ["축구", "풋살", "테니스", "배드민턴", "탁구", "수영", "농구", "배구", "야구", "골프", "볼링", "요가"]
+LEVELS = ["저", "중", "고"]
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 6371.0 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def _rowwise_top(facilities, intensity_map, lat, lon, preferred, age_pref, intensity, indoor_only, limit):
+    """예전 get_profiled_facilities 의 시설별 루프 채점 (모든 시설 채점 후 점수로 안정 정렬)."""
+    results = []
+    for i, row in enumerate(facilities):
+        if indoor_only and row.get("inout_gbn_nm") != "실내":
+            continue
+        ftype = _norm(row.get("ftype_nm") or "")
+        d = _haversine(lat, lon, float(row["faci_lat"]), float(row["faci_lot"]))
+        dist_score = max(0.0, (5.0 - d) / 5.0)
+        pref = 1.0 if any(_norm(sp) in ftype for sp in preferred) else 0.0
+        age = 1.0 if any(sp in ftype for sp in age_pref) else 0.0
+        inten = 0.0
+        if intensity:
+            level = next((v for k, v in intensity_map.items() if k in ftype), None)
+            inten = 1.0 if level == intensity else 0.0
+        total = 0.2 * dist_score + 0.2 * pref + 0.2 * age + 0.2 * age + 0.05 * inten + 0.05 * age
+        results.append((i, round(total, 3)))
+    results.sort(key=lambda r: r[1], reverse=True)
+    return results[:limit]
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    rng = random.Random(7)
+    facilities = []
+    for i in range(3000):
+        names = rng.sample(SPORTS, rng.randint(1, 3))
+        facilities.append(
+            {
+                "faci_cd": f"F{i}",
+                # 송파구 주변 약 30km 범위 (D_MAX 밖 시설이 많게)
+                "faci_lat": 37.50 + rng.uniform(-0.15, 0.15),
+                "faci_lot": 127.10 + rng.uniform(-0.18, 0.18),
+                "ftype_nm": " ".join(names) + rng.choice(["장", " 경기장", "", "교실"]),
+                "inout_gbn_nm": rng.choice(["실내", "실외"]),
+            }
+        )
+    intensity_map = {_norm(s): rng.choice(LEVELS) for s in SPORTS[:9]}
+    sports_pref = {("20대", "남"): tuple(_norm(s) for s in rng.sample(SPORTS, 3))}
+    return facilities, intensity_map, sports_pref, rng
+
+
+def test_score_matches_rowwise_scorer(dataset):
+    facilities, intensity_map, sports_pref, rng = dataset
+    columns = build_facility_snapshot(facilities, intensity_map, sports_pref).columns
+    age_pref = sports_pref[("20대", "남")]
+
+    for _ in range(300):
+        lat = 37.50 + rng.uniform(-0.2, 0.2)
+        lon = 127.10 + rng.uniform(-0.2, 0.2)
+        preferred = rng.sample(SPORTS, rng.randint(0, 2))
+        ages = age_pref if rng.random() < 0.5 else ()
+        intensity = rng.choice([None, *LEVELS])
+        indoor_only = rng.random() < 0.3
+        limit = rng.choice([5, 15])
+
+        expected = _rowwise_top(
+            facilities, intensity_map, lat, lon, preferred, ages, intensity, indoor_only, limit
+        )
+        scored = columns.score(lat, lon, preferred, ages, intensity, indoor_only, limit)
+        got = list(zip(scored.row.tolist(), [round(float(t), 3) for t in scored.total_score]))
+        assert got == expected
+        for r, d in zip(scored.row.tolist(), scored.distance_km.tolist()):
+            row = facilities[r]
+            assert d == pytest.approx(_haversine(lat, lon, row["faci_lat"], row["faci_lot"]), abs=1e-6)
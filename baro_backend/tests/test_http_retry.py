@@ -0,0 +1,66 @@
+# tests/test_http_retry.py
+import asyncio
+import socket
+import threading
+
+import httpx
+import pytest
+import requests
+
+from app.core.http import AsyncHttpClient, HttpClient
+
+
+@pytest.fixture
+def hung_server():
+    """연결은 받지만 응답은 안 보내는 서버. 받은 연결 수를 센다."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(16)
+    accepted = []
+    stop = threading.Event()
+
+    def serve():
+        sock.settimeout(0.1)
+        while not stop.is_set():
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                continue
+            accepted.append(conn)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}/", accepted
+    stop.set()
+    thread.join()
+    for conn in accepted:
+        conn.close()
+    sock.close()
+
+
+def _client(cls):
+    return cls(name="test", pool_size=2, connect_timeout=0.5, read_timeout=0.2, retries=2, backoff_sec=0)
+
+
+def test_read_timeout_is_not_retried(hung_server):
+    url, accepted = hung_server
+    client = _client(HttpClient)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get(url)
+    client.close()
+    assert len(accepted) == 1
+
+
+def test_async_read_timeout_is_not_retried(hung_server):
+    url, accepted = hung_server
+    client = _client(AsyncHttpClient)
+
+    async def call():
+        try:
+            await client.get(url)
+        finally:
+            await client.aclose()
+
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(call())
+    assert len(accepted) == 1
@@ -0,0 +1,43 @@
+# tests/test_jwt_revocation.py
+from uuid import uuid4
+
+import pytest
+
+from app.core.cache import ExpiringSet
+from app.modules.auth import service
+
+
+def test_expiring_set_never_evicts_live_entries():
+    revoked = ExpiringSet(maxsize=2, name="test")
+    assert revoked.add(b"a", ttl_sec=60)
+    assert revoked.add(b"b", ttl_sec=60)
+    assert not revoked.add(b"c", ttl_sec=60)  # 가득 참: 새 항목 거부
+    assert b"a" in revoked and b"b" in revoked and b"c" not in revoked
+    assert revoked.stats()["rejected"] == 1
+
+
+def test_expiring_set_reuses_expired_slots():
+    revoked = ExpiringSet(maxsize=2, name="test")
+    assert revoked.add(b"old", ttl_sec=0)
+    assert revoked.add(b"live", ttl_sec=60)
+    assert revoked.add(b"new", ttl_sec=60)
+    assert b"old" not in revoked and b"live" in revoked and b"new" in revoked
+
+
+@pytest.fixture
+def small_revocation_list(monkeypatch):
+    monkeypatch.setattr(service, "revoked_tokens", ExpiringSet(maxsize=3, name="jwt-revoked"))
+    service.verified_tokens.clear()
+
+
+def test_revoked_tokens_stay_revoked_at_capacity(small_revocation_list):
+    tokens = [service.create_jwt_token(uuid4()) for _ in range(4)]
+    for token in tokens:
+        service.verify_jwt_token(token)
+
+    assert all(service.revoke_jwt_token(t) for t in tokens[:3])
+    # 가득 찬 뒤의 로그아웃은 실패로 알리고, 앞서 로그아웃한 토큰은 여전히 거부
+    assert service.revoke_jwt_token(tokens[3]) is False
+    for token in tokens[:3]:
+        with pytest.raises(ValueError):
+            service.verify_jwt_token(token)
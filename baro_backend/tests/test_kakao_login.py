@@ -0,0 +1,35 @@
+# tests/test_kakao_login.py
+from uuid import uuid4
+
+import pytest
+
+from app.modules.auth import service
+
+
+@pytest.fixture
+def fake_user_profile(monkeypatch):
+    """kakao_id unique 인 user_profile 테이블 흉내 (insert 는 충돌 시 무시)."""
+    rows = {}
+
+    def insert_ignore(table, body, on_conflict):
+        if body[on_conflict] in rows:
+            return None
+        rows[body[on_conflict]] = dict(body, uuid=str(uuid4()), nickname=None)
+        return rows[body[on_conflict]]
+
+    monkeypatch.setattr(service, "_sb_insert_ignore", insert_ignore)
+    monkeypatch.setattr(service, "_get_user_row_by_kakao", rows.get)
+    monkeypatch.setattr(service, "_kakao_identity", lambda token: (token, "카카오닉"))
+    service.user_profile_cache.clear()
+    return rows
+
+
+def test_login_is_new_only_when_row_inserted(fake_user_profile):
+    user, is_new = service.login_with_kakao("k1")
+    assert is_new
+    assert user.sportsmanship == 0.0 and user.preferred_sports == []
+
+    # sign_up 전에 다시 로그인해도(재시도 포함) 이미 있는 row 라 신규 아님
+    again, is_new = service.login_with_kakao("k1")
+    assert not is_new
+    assert again.id == user.id
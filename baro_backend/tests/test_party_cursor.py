@@ -0,0 +1,58 @@
+# tests/test_party_cursor.py
+import base64
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.modules.auth.deps import get_current_user_id
+from app.modules.party import repository
+from app.modules.party.repository import decode_party_cursor, encode_party_cursor
+from app.modules.party.router import router
+
+PARTY_UUID = "3f2b8a9e-1c4d-4e5f-8a6b-7c8d9e0f1a2b"
+
+
+def _raw_cursor(created_at, party_id) -> str:
+    raw = json.dumps([created_at, party_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    created_at = "2025-05-01T12:34:56.123456+00:00"
+    assert decode_party_cursor(encode_party_cursor(created_at, PARTY_UUID)) == (created_at, PARTY_UUID)
+    assert decode_party_cursor(encode_party_cursor(created_at, 42)) == (created_at, "42")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-base64!!",
+        _raw_cursor("2025-05-01T00:00:00+00:00", 42),  # id 가 문자열이 아님
+        _raw_cursor('2025-05-01T00:00:00"),id.gt.(0', PARTY_UUID),
+        _raw_cursor("2025-05-01T00:00:00+00:00", '1"),or(id.gt."0'),
+        _raw_cursor("2025-05-01T00:00:00+00:00", "42\n"),
+        _raw_cursor("yesterday", PARTY_UUID),
+    ],
+)
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_party_cursor(cursor)
+
+
+def test_tampered_cursor_returns_400_without_query(monkeypatch):
+    async def no_query(*args, **kwargs):
+        raise AssertionError("tampered cursor must not reach Supabase")
+
+    monkeypatch.setattr(repository, "_sb_get_async", no_query)
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_user_id] = lambda: PARTY_UUID
+    client = TestClient(app)
+
+    forged = _raw_cursor("2025-05-01T00:00:00+00:00", '1"),or(id.gt."0')
+    resp = client.get("/party", params={"cursor": forged})
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,102 @@
+# tests/test_party_nickname.py
+import asyncio
+import itertools
+
+import pytest
+
+from app.modules.auth import loader
+from app.modules.party import repository
+from app.modules.party.index import party_index
+from app.modules.party.repository import PartyRepository
+from app.modules.party.schemas import CreatePartyRequest
+
+HOST = "11111111-1111-4111-8111-111111111111"
+GUEST = "22222222-2222-4222-8222-222222222222"
+PROFILES = {HOST: {"uuid": HOST, "nickname": "호스트"}, GUEST: {"uuid": GUEST, "nickname": "게스트"}}
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    tables = {"party": [], "party_member": []}
+    ids = itertools.count(1)
+
+    def matches(row, params):
+        for key, cond in params.items():
+            if key in ("select", "limit", "order"):
+                continue
+            if not cond.startswith("eq.") or str(row.get(key)) != cond[3:]:
+                return False
+        return True
+
+    async def sb_get(table, params):
+        return [dict(r) for r in tables[table] if matches(r, params)]
+
+    async def sb_post(table, body):
+        row = {"id": next(ids), **body}
+        tables[table].append(row)
+        return dict(row)
+
+    async def sb_patch(table, params, body):
+        for row in tables[table]:
+            if matches(row, params):
+                row.update(body)
+
+    async def profiles_by_ids(user_ids):
+        return {str(u): PROFILES[str(u)] for u in user_ids if str(u) in PROFILES}
+
+    monkeypatch.setattr(repository, "_sb_get_async", sb_get)
+    monkeypatch.setattr(repository, "_sb_post_async", sb_post)
+    monkeypatch.setattr(repository, "_sb_patch_async", sb_patch)
+    monkeypatch.setattr(loader, "_get_user_rows_by_ids_async", profiles_by_ids)
+    monkeypatch.setattr(party_index, "upsert", lambda party: None)
+    return tables
+
+
+def test_create_and_join_store_profile_nickname(fake_db):
+    req = CreatePartyRequest(
+        title="배드민턴",
+        sport="배드민턴",
+        place="송파",
+        description="",
+        date="2025-05-01",
+        start_time="19:00",
+        end_time="21:00",
+        capacity=4,
+    )
+
+    async def run():
+        party = await PartyRepository().create_party(HOST, req)
+        await PartyRepository().join_party(party.party_id, GUEST)
+
+    asyncio.run(run())
+    stored = {r["user_id"]: r["nickname"] for r in fake_db["party_member"]}
+    assert stored == {HOST: "호스트", GUEST: "게스트"}
+
+
+def test_rejoin_fills_blank_nickname(fake_db):
+    fake_db["party"].append(
+        {"id": 7, "title": "t", "sport": "s", "place": "p", "capacity": 4, "current": 0, "host_id": HOST}
+    )
+    fake_db["party_member"].append(
+        {"id": 99, "party_id": "7", "user_id": GUEST, "nickname": "", "role": "member", "status": "left"}
+    )
+
+    asyncio.run(PartyRepository().join_party("7", GUEST))
+    assert fake_db["party_member"][0]["nickname"] == "게스트"
+    assert fake_db["party_member"][0]["status"] == "joined"
+
+
+def test_party_detail_survives_profile_outage(fake_db, monkeypatch):
+    fake_db["party"].append(
+        {"id": 7, "title": "t", "sport": "s", "place": "p", "capacity": 4, "current": 1, "host_id": HOST}
+    )
+    fake_db["party_member"].append(
+        {"id": 99, "party_id": "7", "user_id": HOST, "nickname": "호스트", "role": "host", "status": "joined"}
+    )
+
+    async def unavailable(user_ids):
+        raise RuntimeError("Supabase GET 실패: 503")
+
+    monkeypatch.setattr(loader, "_get_user_rows_by_ids_async", unavailable)
+    party = asyncio.run(PartyRepository().get_party("7", None))
+    assert [(m.nickname, m.sportsmanship) for m in party.members] == [("호스트", None)]
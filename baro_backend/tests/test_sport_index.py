@@ -0,0 +1,41 @@
+# tests/test_sport_index.py
+from app.modules.facility.engine import _norm
+from app.modules.facility.sport_index import SportMatcher
+
+# 송파구 체육시설 데이터의 실제 ftype_nm 값들 (baro_database 노트북의 unique() 결과 + 공백 섞인 표기)
+FACILITY_TYPES = [
+    "체력단련장", "유도", "간이운동장", "태권도", "축구장", "권투", "검도", "당구장", "실내",
+    "스크린", "생활체육관", "골프연습장", "테니스장", "구기체육관", "기타시설", "수영장", "야구장",
+    "롤러스케이트장", "사이클경기장", "투기체육관", "러닝", "풋살", "농구", "배드민턴", "탁구",
+    "헬스", "볼링", "요가", "필라테스", "주짓수", "복싱", "킥복싱", "레슬링", "합기도", "스크린야구",
+    "게이트볼", "롤러스케이팅", "간이운동", "스크린 야구장", "실내 골프연습장", "배드민턴 전용구장", "",
+]
+
+# exercise_methods 종목명 + 연령/성별 선호 종목 (서로 겹치는 이름 포함: 복싱/킥복싱, 야구/스크린야구)
+SPORTS = [
+    "축구", "풋살", "농구", "배구", "야구", "스크린야구", "테니스", "배드민턴", "탁구", "골프",
+    "수영", "헬스", "요가", "필라테스", "볼링", "당구", "권투", "복싱", "킥복싱", "태권도", "유도",
+    "검도", "주짓수", "레슬링", "합기도", "러닝", "사이클", "롤러스케이트", "게이트볼", "스쿼시",
+    "클라이밍", "걷기", "체력 단련",
+]
+
+
+def _substring_ids(matcher: SportMatcher, ftype: str):
+    # 예전 db._match_sport: _norm(sport) in _norm(ftype)
+    text = _norm(ftype)
+    return [sid for sid, name in enumerate(matcher.names) if name in text]
+
+
+def test_matcher_agrees_with_substring_matching():
+    matcher = SportMatcher(_norm(s) for s in SPORTS)
+    assert len(matcher) == len(SPORTS)
+    for ftype in FACILITY_TYPES:
+        assert matcher.find_ids(_norm(ftype)) == _substring_ids(matcher, ftype), ftype
+
+
+def test_overlapping_names_all_match():
+    matcher = SportMatcher(_norm(s) for s in SPORTS)
+    found = {matcher.names[i] for i in matcher.find_ids(_norm("스크린 야구장"))}
+    assert found == {"야구", "스크린야구"}
+    found = {matcher.names[i] for i in matcher.find_ids(_norm("킥복싱"))}
+    assert found == {"복싱", "킥복싱"}
@@ -0,0 +1,73 @@
+# tests/test_weather_breaker.py
+import pytest
+import requests
+
+from app.modules.bot import forecast, weather
+
+
+class _FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self._payload = payload
+
+    def json(self):
+        if self._payload is None:
+            raise ValueError("not json")
+        return self._payload
+
+
+EMPTY = {"response": {"header": {"resultCode": "03"}, "body": {"items": ""}}}
+
+
+@pytest.fixture(autouse=True)
+def fresh_breaker(monkeypatch):
+    breaker = weather.CircuitBreaker(name="kma-test", failure_threshold=3, reset_sec=60)
+    monkeypatch.setattr(weather, "weather_breaker", breaker)
+    monkeypatch.setattr(forecast, "weather_breaker", breaker)
+    weather.observation_cache.clear()
+    forecast.forecast_cache.clear()
+    return breaker
+
+
+def _serve(monkeypatch, respond):
+    monkeypatch.setattr(weather.kma_http, "get", lambda url, **kwargs: respond())
+
+
+def test_empty_response_is_a_cache_miss_not_a_failure(monkeypatch, fresh_breaker):
+    _serve(monkeypatch, lambda: _FakeResponse(200, EMPTY))
+    for nx in range(10):
+        assert weather.get_cell_observation(nx, 1) is None
+        assert forecast.get_cell_forecast(forecast.ULTRA, nx, 1) is None
+    assert fresh_breaker.state == "closed"
+    assert len(weather.observation_cache) == 0
+
+
+def test_transport_errors_and_5xx_open_the_breaker(monkeypatch, fresh_breaker):
+    def refuse():
+        raise requests.ConnectionError("refused")
+
+    _serve(monkeypatch, refuse)
+    weather.get_cell_observation(1, 1)
+    forecast.get_cell_forecast(forecast.SHORT, 2, 1)
+    _serve(monkeypatch, lambda: _FakeResponse(503))
+    weather.get_cell_observation(3, 1)
+    assert fresh_breaker.state == "open"
+
+
+def test_client_errors_do_not_count(monkeypatch, fresh_breaker):
+    _serve(monkeypatch, lambda: _FakeResponse(400))
+    for nx in range(5):
+        weather.get_cell_observation(nx, 1)
+    assert fresh_breaker.state == "closed"
+
+
+def test_unexpected_errors_count_as_failures(monkeypatch, fresh_breaker):
+    def explode():
+        raise RuntimeError("boom")
+
+    _serve(monkeypatch, explode)
+    assert weather.get_cell_observation(1, 1) is None
+    assert forecast.get_cell_forecast(forecast.ULTRA, 2, 1) is None
+    weather.get_cell_observation(3, 1)
+    assert fresh_breaker.state == "open"